@@ -1,8 +1,58 @@
-from django.contrib import admin
-from django.db.models import Q
-from django.utils import timezone
+import logging
 
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.contrib.admin.views.main import PAGE_VAR
+from django.contrib.auth import get_user_model
+from django.contrib.auth.admin import UserAdmin
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.db.models.functions import Now
+from django.template.response import TemplateResponse
+
+from . import moderation
+from .forms import PostCategoryForm
 from .models import Category, Location, Post, Comment
+from .paginators import LimitedCountPaginator
+from .search import COMMENT_INDEX
+
+
+User = get_user_model()
+
+logger = logging.getLogger(__name__)
+
+
+def run_bulk_action(modeladmin, request, operation, description):
+    """Run a chunked moderation operation, logging progress per chunk."""
+    processed = chunks = 0
+    for count in operation:
+        processed += count
+        chunks += 1
+        logger.info('%s: обработано %d', description, processed)
+    modeladmin.message_user(
+        request,
+        f'{description}: обработано {processed} (частей: {chunks}).',
+        messages.SUCCESS,
+    )
+
+
+class LargeTableAdminMixin:
+    """Changelist that never counts the whole table."""
+
+    paginator = LimitedCountPaginator
+    show_full_result_count = False
+    # A capped count cannot tell whether "show all" would stay small.
+    list_max_show_all = 0
+
+    def get_paginator(self, request, queryset, per_page, orphans=0,
+                      allow_empty_first_page=True):
+        try:
+            page_number = int(request.GET.get(PAGE_VAR, 1))
+        except ValueError:
+            page_number = 1
+        return self.paginator(
+            queryset, per_page, orphans, allow_empty_first_page,
+            page_number=page_number,
+        )
 
 
 class PostPublishedListFilter(admin.SimpleListFilter):
@@ -12,28 +62,40 @@ class PostPublishedListFilter(admin.SimpleListFilter):
     def lookups(self, request, model_admin):
         return [
             ('published', ('Опубликовано')),
-            ('not_published', ('Не опубликовано'))
+            ('not_published', ('Не опубликовано')),
+            ('scheduled', ('Запланировано')),
         ]
 
     def queryset(self, request, queryset):
         if self.value() == 'published':
-            return queryset.filter(
-                pub_date__lte=timezone.now(),
-                is_published=True,
-                category__is_published=True,
-            )
+            return queryset.filter(is_visible=True)
         if self.value() == 'not_published':
-            return queryset.filter(
-                Q(pub_date__gte=timezone.now())
-                | Q(is_published=False)
-                | Q(category__is_published=False)
-            )
+            return queryset.filter(is_visible=False)
+        if self.value() == 'scheduled':
+            return queryset.filter(scheduled=True)
 
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
     list_display = ('title', 'is_published')
     search_fields = ['title']
+    actions = ['publish', 'unpublish']
+
+    @admin.action(description='Опубликовать выбранные категории')
+    def publish(self, request, queryset):
+        run_bulk_action(
+            self, request,
+            moderation.set_categories_published(queryset, True),
+            'Опубликованы категории',
+        )
+
+    @admin.action(description='Снять с публикации выбранные категории')
+    def unpublish(self, request, queryset):
+        run_bulk_action(
+            self, request,
+            moderation.set_categories_published(queryset, False),
+            'Сняты с публикации категории',
+        )
 
 
 @admin.register(Location)
@@ -43,23 +105,149 @@ class LocationAdmin(admin.ModelAdmin):
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ['title', 'created_at', 'post_published', 'is_scheduled']
     list_filter = [PostPublishedListFilter]
     search_fields = ['pk', 'title']
+    ordering = ['-id']
+    actions = ['publish', 'unpublish', 'change_category']
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            scheduled=ExpressionWrapper(
+                Q(pub_date__gt=Now()), output_field=BooleanField()
+            ),
+        )
 
-    @admin.display(boolean=True, description='Опубликовано')
+    @admin.display(boolean=True, description='Опубликовано',
+                   ordering='is_visible')
     def post_published(self, obj):
-        scheduled = self.is_scheduled(obj)
-        published = obj.category.is_published and obj.is_published
-        return published and scheduled
+        return obj.is_visible
 
-    @admin.display(boolean=True, description='Запланированно')
+    @admin.display(boolean=True, description='Запланированно',
+                   ordering='scheduled')
     def is_scheduled(self, obj):
-        return obj.pub_date <= timezone.now()
+        return obj.scheduled
+
+    @admin.action(description='Опубликовать выбранные публикации')
+    def publish(self, request, queryset):
+        run_bulk_action(
+            self, request,
+            moderation.set_posts_published(queryset, True),
+            'Опубликованы публикации',
+        )
+
+    @admin.action(description='Снять с публикации выбранные публикации')
+    def unpublish(self, request, queryset):
+        run_bulk_action(
+            self, request,
+            moderation.set_posts_published(queryset, False),
+            'Сняты с публикации публикации',
+        )
+
+    @admin.action(description='Перенести выбранные публикации в категорию')
+    def change_category(self, request, queryset):
+        form = PostCategoryForm(request.POST if 'apply' in request.POST
+                                else None)
+        if form.is_valid():
+            category = form.cleaned_data['category']
+            run_bulk_action(
+                self, request,
+                moderation.set_posts_category(queryset, category),
+                f'Перенесены в категорию «{category.title}» публикации',
+            )
+            return None
+        return TemplateResponse(
+            request,
+            'admin/blog/post/change_category.html',
+            {
+                **self.admin_site.each_context(request),
+                'title': 'Перенос публикаций в другую категорию',
+                'opts': self.model._meta,
+                'form': form,
+                'selected': request.POST.getlist(helpers.ACTION_CHECKBOX_NAME),
+                'select_across': request.POST.get('select_across', '0'),
+                'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+            },
+        )
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
-    list_display = ['text']
-    search_fields = ['post__id', 'author_username']
+class CommentAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ['text', 'post', 'author', 'created_at']
+    list_select_related = ['post', 'author']
+    search_fields = ['text']
+    ordering = ['-id']
+    actions = ['delete_comments', 'delete_authors_comments']
+
+    def get_search_results(self, request, queryset, search_term):
+        """Search by `#<post id>`, `@<username>` or comment text.
+
+        Every form is answered from an index: the post foreign key, the
+        unique username and the comment full-text index.
+        """
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        post_id = search_term.lstrip('#')
+        if post_id.isdecimal():
+            return queryset.filter(post_id=int(post_id)), False
+        if search_term.startswith('@'):
+            return queryset.filter(author__username=search_term[1:]), False
+        return COMMENT_INDEX.search(queryset, search_term), False
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        # The stock action loads and deletes comments one by one.
+        actions.pop('delete_selected', None)
+        return actions
+
+    @admin.action(description='Удалить выбранные комментарии',
+                  permissions=['delete'])
+    def delete_comments(self, request, queryset):
+        run_bulk_action(
+            self, request,
+            moderation.delete_comments(queryset),
+            'Удалены комментарии',
+        )
+
+    @admin.action(description='Удалить все комментарии их авторов',
+                  permissions=['delete'])
+    def delete_authors_comments(self, request, queryset):
+        # Materialised first: the selected comments go in the first chunk.
+        authors = set(queryset.values_list('author_id', flat=True))
+        run_bulk_action(
+            self, request,
+            moderation.delete_comments(
+                Comment.objects.filter(author_id__in=authors)
+            ),
+            'Удалены комментарии авторов',
+        )
+
+
+admin.site.unregister(User)
+
+
+@admin.register(User)
+class BlogUserAdmin(UserAdmin):
+    actions = ['unpublish_posts', 'delete_comments']
+
+    @admin.action(description='Снять с публикации все публикации')
+    def unpublish_posts(self, request, queryset):
+        run_bulk_action(
+            self, request,
+            moderation.set_posts_published(
+                Post.objects.filter(author__in=queryset), False
+            ),
+            'Сняты с публикации публикации пользователей',
+        )
+
+    @admin.action(description='Удалить все комментарии')
+    def delete_comments(self, request, queryset):
+        run_bulk_action(
+            self, request,
+            moderation.delete_comments(
+                Comment.objects.filter(author__in=queryset)
+            ),
+            'Удалены комментарии пользователей',
+        )
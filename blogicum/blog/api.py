@@ -0,0 +1,305 @@
+"""Read-only JSON API.
+
+Every endpoint accepts `fields=` with a comma separated subset of its
+fields; only the columns those fields need are loaded. Lists are paged
+by cursor (`cursor=`, `limit=`) and streamed item by item. Responses
+carry an ETag derived from the cache generations of the data they show,
+so unchanged resources are answered with 304 before any listing query.
+"""
+import json
+from collections import namedtuple
+from hashlib import md5
+
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.views import View
+
+from . import mixins
+from .caching import (
+    FEED_SCOPE,
+    SITE_SCOPE,
+    get_versions,
+    post_scope,
+    version_key
+)
+from .models import Category, Comment, Location, Post
+
+
+API_DEFAULT_LIMIT = 20
+API_MAX_LIMIT = 100
+
+ApiField = namedtuple('ApiField', ('paths', 'get'))
+
+User = get_user_model()
+
+
+class ApiError(Exception):
+    pass
+
+
+def attr(path):
+    """Field read from a model attribute, following `__` relations."""
+    names = path.split('__')
+
+    def get(obj):
+        for name in names:
+            if obj is None:
+                return None
+            obj = getattr(obj, name)
+        return obj
+
+    return ApiField((path,), get)
+
+
+def image(path):
+    def get(obj):
+        file = getattr(obj, path)
+        return file.url if file else None
+
+    return ApiField((path,), get)
+
+
+def published_location():
+    def get(post):
+        location = post.location
+        if location is None or not location.is_published:
+            return None
+        return location.name
+
+    return ApiField(('location__name', 'location__is_published'), get)
+
+
+class ApiView(View):
+    http_method_names = ['get', 'head', 'options']
+    api_fields = {}
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except ApiError as error:
+            return JsonResponse({'detail': str(error)}, status=400)
+        except Http404:
+            return JsonResponse({'detail': 'Не найдено.'}, status=404)
+
+    def get_fields(self):
+        requested = self.request.GET.get('fields')
+        if not requested:
+            return list(self.api_fields)
+        fields = [name.strip() for name in requested.split(',')]
+        unknown = set(fields) - set(self.api_fields)
+        if unknown:
+            raise ApiError(
+                f'Неизвестные поля: {", ".join(sorted(unknown))}.'
+            )
+        return list(dict.fromkeys(fields))
+
+    def get_required_paths(self):
+        return ('pk',)
+
+    def select_fields(self, queryset, fields):
+        """Load only the columns and relations the fields need."""
+        paths = {
+            path for name in fields for path in self.api_fields[name].paths
+        }
+        paths.update(self.get_required_paths())
+        relations = {
+            path.rsplit('__', 1)[0] for path in paths if '__' in path
+        }
+        return queryset.select_related(None).select_related(
+            *relations
+        ).only(*paths)
+
+    def serialize(self, obj, fields):
+        return {name: self.api_fields[name].get(obj) for name in fields}
+
+    def get_etag_scopes(self):
+        return ()
+
+    def get_etag(self):
+        keys = [
+            version_key('page', scope)
+            for scope in (SITE_SCOPE, *self.get_etag_scopes())
+        ]
+        versions = get_versions(keys)
+        user = self.request.user
+        return quote_etag(md5('|'.join((
+            *(versions[key] for key in keys),
+            str(user.pk) if user.is_authenticated else '',
+            self.request.get_full_path(),
+        )).encode()).hexdigest())
+
+    def get(self, request, *args, **kwargs):
+        fields = self.get_fields()
+        etag = self.get_etag()
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = self.render(fields)
+        response['ETag'] = etag
+        return response
+
+    def render(self, fields):
+        return JsonResponse(
+            self.serialize(self.get_object(fields), fields),
+            json_dumps_params={'ensure_ascii': False},
+        )
+
+
+class ApiListView(mixins.CursorPaginationMixin, ApiView):
+    cursor_ordering = ('-id',)
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.GET.get('limit', API_DEFAULT_LIMIT))
+        except ValueError:
+            raise ApiError('Параметр limit должен быть числом.')
+        return max(1, min(limit, API_MAX_LIMIT))
+
+    def get_required_paths(self):
+        return ('pk', *(name.lstrip('-') for name in self.cursor_ordering))
+
+    def get_page_url(self, cursor):
+        if cursor is None:
+            return None
+        return self.request.build_absolute_uri(
+            f'{self.request.path}?{self.get_cursor_querystring(cursor)}'
+        )
+
+    def render(self, fields):
+        queryset = self.select_fields(self.get_queryset(), fields)
+        page = self.paginate_queryset(queryset, self.get_limit())[1]
+        return StreamingHttpResponse(
+            self.stream(page, fields), content_type='application/json'
+        )
+
+    def stream(self, page, fields):
+        yield '{"results": ['
+        for index, obj in enumerate(page):
+            yield (',' if index else '') + json.dumps(
+                self.serialize(obj, fields),
+                cls=DjangoJSONEncoder,
+                ensure_ascii=False,
+            )
+        yield '], "next": {}, "previous": {}}}'.format(
+            json.dumps(self.get_page_url(page.next_cursor)),
+            json.dumps(self.get_page_url(page.previous_cursor)),
+        )
+
+
+POST_FIELDS = {
+    'id': attr('id'),
+    'title': attr('title'),
+    'text': attr('text'),
+    'pub_date': attr('pub_date'),
+    'author': attr('author__username'),
+    'category': attr('category__slug'),
+    'location': published_location(),
+    'image': image('image'),
+    'comments_count': attr('comments_count'),
+}
+
+
+class PostListApiView(mixins.ValidPostQueryMixin, ApiListView):
+    """Visible posts, newest first; filter with `category=`/`author=`."""
+
+    api_fields = POST_FIELDS
+    cursor_ordering = ('-pub_date', '-id')
+
+    def is_own_feed(self):
+        user = self.request.user
+        return (user.is_authenticated
+                and self.request.GET.get('author') == user.username)
+
+    def get_queryset(self):
+        queryset = Post.objects.all()
+        if not self.is_own_feed():
+            queryset = self.valid_filters(queryset)
+        if 'category' in self.request.GET:
+            queryset = queryset.filter(
+                category__slug=self.request.GET['category']
+            )
+        if 'author' in self.request.GET:
+            queryset = queryset.filter(
+                author__username=self.request.GET['author']
+            )
+        return queryset
+
+    def get_etag_scopes(self):
+        return (FEED_SCOPE,)
+
+
+class PostApiView(mixins.ValidPostQueryMixin, ApiView):
+    api_fields = POST_FIELDS
+
+    def get_etag_scopes(self):
+        return (post_scope(self.kwargs['post_id']),)
+
+    def get_object(self, fields):
+        queryset = Post.objects.filter(self.visible_to_q(self.request.user))
+        return get_object_or_404(
+            self.select_fields(queryset, fields), pk=self.kwargs['post_id']
+        )
+
+
+class CommentListApiView(mixins.ValidPostQueryMixin, ApiListView):
+    api_fields = {
+        'id': attr('id'),
+        'text': attr('text'),
+        'created_at': attr('created_at'),
+        'author': attr('author__username'),
+    }
+    cursor_ordering = mixins.COMMENTS_ORDERING
+
+    def get_etag_scopes(self):
+        return (post_scope(self.kwargs['post_id']),)
+
+    def get_queryset(self):
+        post = get_object_or_404(
+            Post.objects.filter(
+                self.visible_to_q(self.request.user)
+            ).only('id'),
+            pk=self.kwargs['post_id'],
+        )
+        return Comment.objects.filter(post=post)
+
+
+class CategoryListApiView(ApiListView):
+    api_fields = {
+        'id': attr('id'),
+        'slug': attr('slug'),
+        'title': attr('title'),
+        'description': attr('description'),
+    }
+    cursor_ordering = ('id',)
+
+    def get_queryset(self):
+        return Category.objects.filter(is_published=True)
+
+
+class LocationListApiView(ApiListView):
+    api_fields = {
+        'id': attr('id'),
+        'name': attr('name'),
+    }
+    cursor_ordering = ('id',)
+
+    def get_queryset(self):
+        return Location.objects.filter(is_published=True)
+
+
+class ProfileApiView(ApiView):
+    api_fields = {
+        'username': attr('username'),
+        'first_name': attr('first_name'),
+        'last_name': attr('last_name'),
+        'date_joined': attr('date_joined'),
+    }
+
+    def get_object(self, fields):
+        return get_object_or_404(
+            self.select_fields(User.objects.all(), fields),
+            username=self.kwargs['username'],
+        )
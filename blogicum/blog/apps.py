@@ -1,7 +1,17 @@
 from django.apps import AppConfig
+from django.core.signals import request_started
 
 
 class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog'
     verbose_name = 'Блог'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        # Started with the first request rather than here, so that
+        # management commands do not run it.
+        from .scheduler import start_ticker_on_request
+        request_started.connect(
+            start_ticker_on_request, dispatch_uid='blog.scheduler'
+        )
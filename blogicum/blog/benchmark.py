@@ -0,0 +1,330 @@
+import random
+import statistics
+import subprocess
+import threading
+import time
+from datetime import timedelta
+from io import StringIO
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.conf import settings
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+from mixer.backend.django import mixer
+
+from blog import urls as blog_urls
+from blog.models import Category, Comment, Location, Post
+from pages import urls as pages_urls
+
+
+BATCH_SIZE = 1000
+FUTURE_POSTS_SHARE = 0.05
+UNPUBLISHED_POSTS_SHARE = 0.05
+BENCHMARK_USERNAME = 'benchmark'
+
+# Connection profiles compared under mixed load: Django's defaults (a new
+# connection per request, rollback journal, deferred transactions) against
+# the configured ones. A profile overrides the database settings and the
+# whole SQLITE_PRAGMAS it names.
+MIXED_PROFILES = {
+    'default': {
+        'database': {'CONN_MAX_AGE': 0, 'OPTIONS': {}},
+        'pragmas': {'journal_mode': 'delete'},
+    },
+    'configured': {},
+}
+
+User = get_user_model()
+
+
+def blend_in_batches(model, total, batch_size=BATCH_SIZE, **params):
+    created = 0
+    while created < total:
+        size = min(batch_size, total - created)
+        with mixer.ctx(commit=False):
+            objects = mixer.cycle(size).blend(model, **params)
+        model.objects.bulk_create(objects, batch_size=batch_size)
+        created += size
+
+
+def seed(posts, users=None, categories=None, locations=None,
+         comments_per_post=3, seed_value=0):
+    """Fill the current database with a synthetic blog of given scale."""
+    rng = random.Random(seed_value)
+    users = users or max(10, posts // 100)
+    categories = categories or max(5, posts // 1000)
+    locations = locations or max(5, posts // 1000)
+
+    blend_in_batches(User, users - 1)
+    mixer.blend(User, username=BENCHMARK_USERNAME)
+    blend_in_batches(Category, categories, is_published=True)
+    blend_in_batches(Location, locations, is_published=True)
+
+    user_ids = list(User.objects.values_list('id', flat=True))
+    category_ids = list(Category.objects.values_list('id', flat=True))
+    location_ids = list(Location.objects.values_list('id', flat=True))
+    now = timezone.now()
+
+    def post_params():
+        offset = timedelta(seconds=rng.randint(1, 365 * 24 * 60 * 60))
+        future = rng.random() < FUTURE_POSTS_SHARE
+        return {
+            'author_id': rng.choice(user_ids),
+            'category_id': rng.choice(category_ids),
+            'location_id': rng.choice(location_ids),
+            'pub_date': now + offset if future else now - offset,
+            'is_published': rng.random() >= UNPUBLISHED_POSTS_SHARE,
+            'image': '',
+        }
+
+    created = 0
+    while created < posts:
+        size = min(BATCH_SIZE, posts - created)
+        with mixer.ctx(commit=False):
+            objects = mixer.cycle(size).blend(Post)
+        for post in objects:
+            for field, value in post_params().items():
+                setattr(post, field, value)
+        Post.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+        created += size
+
+    post_ids = list(Post.objects.values_list('id', flat=True))
+    total_comments = posts * comments_per_post
+    created = 0
+    while created < total_comments:
+        size = min(BATCH_SIZE, total_comments - created)
+        with mixer.ctx(commit=False):
+            objects = mixer.cycle(size).blend(Comment)
+        for comment in objects:
+            comment.post_id = rng.choice(post_ids)
+            comment.author_id = rng.choice(user_ids)
+        Comment.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+        created += size
+
+    Post.objects.refresh_visibility()
+    call_command('recount_comments', stdout=StringIO())
+    call_command('rebuild_search_index', stdout=StringIO())
+    cache.clear()
+
+
+def get_route_kwargs():
+    author = User.objects.get(username=BENCHMARK_USERNAME)
+    post = Post.objects.filter(author=author, is_visible=True).first() or (
+        Post.objects.filter(author=author).first()
+    )
+    if post is None:
+        post = mixer.blend(Post, author=author, image='')
+    comment = post.comments.filter(author=author).first() or mixer.blend(
+        Comment, post=post, author=author
+    )
+    return author, {
+        'post_id': post.id,
+        'comment_id': comment.id,
+        'username': author.username,
+        'category_slug': post.category.slug,
+    }
+
+
+def get_routes():
+    for namespace, urlconf in (('blog', blog_urls), ('pages', pages_urls)):
+        for pattern in urlconf.urlpatterns:
+            if isinstance(pattern, URLPattern) and pattern.name:
+                yield f'{namespace}:{pattern.name}', pattern
+
+
+def percentile(values, share):
+    values = sorted(values)
+    return values[min(len(values) - 1, round(share * (len(values) - 1)))]
+
+
+def measure(client, url, repeat, cold=False):
+    timings, queries, size, status = [], [], 0, None
+    for _ in range(repeat + 1):
+        if cold:
+            cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            response = client.get(url)
+            elapsed = time.perf_counter() - started
+        status = response.status_code
+        # Streamed responses are read here, so the size covers the body.
+        size = len(
+            b''.join(response.streaming_content) if response.streaming
+            else response.content
+        )
+        queries.append(len(ctx.captured_queries))
+        timings.append(elapsed * 1000)
+    # The first request warms caches and is reported only as query count.
+    return {
+        'status': status,
+        'queries_first': queries[0],
+        'queries': queries[-1],
+        'p50_ms': round(statistics.median(timings[1:]), 3),
+        'p95_ms': round(percentile(timings[1:], 0.95), 3),
+        'size_bytes': size,
+    }
+
+
+def run(repeat=20, cold=False):
+    author, route_kwargs = get_route_kwargs()
+    anonymous = Client()
+    logged_in = Client()
+    logged_in.force_login(author)
+
+    results = []
+    for name, pattern in get_routes():
+        kwargs = {
+            key: route_kwargs[key] for key in pattern.pattern.converters
+        }
+        url = reverse(name, kwargs=kwargs)
+        for client_name, client in (('anonymous', anonymous),
+                                    ('author', logged_in)):
+            result = {'route': name, 'url': url, 'client': client_name}
+            try:
+                result.update(measure(client, url, repeat, cold))
+            except Exception as error:
+                result['error'] = f'{type(error).__name__}: {error}'
+            results.append(result)
+    return results
+
+
+def run_mixed_worker(client, read_urls, write_url, requests, write_share,
+                     rng, barrier, result):
+    barrier.wait()
+    try:
+        for _ in range(requests):
+            write = rng.random() < write_share
+            started = time.perf_counter()
+            try:
+                if write:
+                    response = client.post(write_url, {'text': 'Бенчмарк'})
+                else:
+                    response = client.get(rng.choice(read_urls))
+                failed = response.status_code >= 400
+            except Exception:
+                failed = True
+            result['timings'].append((time.perf_counter() - started) * 1000)
+            result['writes'] += write
+            result['errors'] += failed
+    finally:
+        connections.close_all()
+
+
+def run_mixed_profile(author, route_kwargs, threads, requests, write_share,
+                      seed_value=0):
+    read_urls = [
+        reverse('blog:index'),
+        reverse('blog:post_detail', args=(route_kwargs['post_id'],)),
+        reverse('blog:category_posts', args=(route_kwargs['category_slug'],)),
+    ]
+    write_url = reverse('blog:add_comment', args=(route_kwargs['post_id'],))
+    barrier = threading.Barrier(threads + 1)
+    results = [
+        {'timings': [], 'writes': 0, 'errors': 0} for _ in range(threads)
+    ]
+    # Test clients re-raise exceptions of every thread's requests.
+    clients = [
+        Client(raise_request_exception=False) for _ in range(threads)
+    ]
+    for client in clients:
+        client.force_login(author)
+    workers = [
+        threading.Thread(target=run_mixed_worker, args=(
+            clients[index], read_urls, write_url, requests, write_share,
+            random.Random(seed_value + index), barrier, results[index],
+        ))
+        for index in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    timings = [timing for result in results for timing in result['timings']]
+    return {
+        'threads': threads,
+        'requests': len(timings),
+        'writes': sum(result['writes'] for result in results),
+        'errors': sum(result['errors'] for result in results),
+        'throughput_rps': round(len(timings) / elapsed, 1),
+        'p50_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(percentile(timings, 0.95), 3),
+    }
+
+
+def run_mixed(threads=8, requests=50, write_share=0.2):
+    """Measure throughput of concurrent logged-in reads and comment writes.
+
+    Every connection profile of MIXED_PROFILES is measured on the same
+    data; pragmas apply to connections opened after the switch.
+    """
+    author, route_kwargs = get_route_kwargs()
+    database = connections['default'].settings_dict
+    configured = {key: database[key] for key in ('CONN_MAX_AGE', 'OPTIONS')}
+    results = []
+    try:
+        for name, profile in MIXED_PROFILES.items():
+            connections.close_all()
+            database.update(configured, **profile.get('database', {}))
+            pragmas = profile.get('pragmas', settings.SQLITE_PRAGMAS)
+            with override_settings(SQLITE_PRAGMAS=pragmas):
+                # The journal mode can only change while no other
+                # connection is open.
+                connection.ensure_connection()
+                results.append({'profile': name, **run_mixed_profile(
+                    author, route_kwargs, threads, requests, write_share
+                )})
+    finally:
+        database.update(configured)
+        connections.close_all()
+    return results
+
+
+def get_meta(**options):
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'timestamp': timezone.now().isoformat(),
+        'posts': Post.objects.count(),
+        'comments': Comment.objects.count(),
+        **options,
+    }
+
+
+def compare(previous, current):
+    """Yield (route, client, metric, before, after) for changed metrics."""
+    before = {(r['route'], r['client']): r for r in previous['results']}
+    for result in current['results']:
+        old = before.get((result['route'], result['client']))
+        if old is None:
+            continue
+        for metric in ('queries', 'p50_ms', 'p95_ms', 'size_bytes'):
+            if (metric in old and metric in result
+                    and old[metric] != result[metric]):
+                yield (result['route'], result['client'], metric,
+                       old[metric], result[metric])
+    before = {r['profile']: r for r in previous.get('mixed', ())}
+    for result in current.get('mixed', ()):
+        old = before.get(result['profile'])
+        if old is None:
+            continue
+        for metric in ('throughput_rps', 'p95_ms', 'errors'):
+            if old[metric] != result[metric]:
+                yield ('mixed', result['profile'], metric,
+                       old[metric], result[metric])
@@ -0,0 +1,168 @@
+from hashlib import md5
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import router, transaction
+
+from .models import Category, Post
+
+
+POST_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+VERSION_KEY = 'blog:version:{label}:{pk}'
+
+
+def version_key(label, pk):
+    return VERSION_KEY.format(label=label, pk=pk)
+
+
+def _set_version(key):
+    cache.set(key, uuid4().hex, None)
+
+
+def bump_version(label, pk):
+    key = version_key(label, pk)
+    _set_version(key)
+    transaction.on_commit(lambda: _set_version(key))
+
+
+def bump_versions(label, pks):
+    keys = [version_key(label, pk) for pk in pks]
+
+    def set_versions():
+        cache.set_many({key: uuid4().hex for key in keys}, None)
+
+    set_versions()
+    transaction.on_commit(set_versions)
+
+
+def get_versions(keys):
+    versions = cache.get_many(keys)
+    missing = {key: uuid4().hex for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return versions
+
+
+def read_version_key():
+    """Version of the database the current request reads posts from.
+
+    Caches filled from a lagging replica are never served to readers of
+    the primary, and expire once the replica has caught up.
+    """
+    return version_key('db', router.db_for_read(Post))
+
+
+def set_post_card_versions(posts):
+    """Attach to every post a stamp of all data its card depends on."""
+    read_key = read_version_key()
+    card_keys = {
+        post.pk: (
+            read_key,
+            version_key('blog.post', post.pk),
+            version_key('blog.category', post.category_id),
+            version_key('blog.location', post.location_id),
+            version_key('auth.user', post.author_id),
+        )
+        for post in posts
+    }
+    versions = get_versions(
+        {key for keys in card_keys.values() for key in keys}
+    )
+    for post in posts:
+        post.card_version = '.'.join(
+            versions[key] for key in card_keys[post.pk]
+        )
+
+
+PAGE_CACHE_TIMEOUT = 60 * 10
+
+POSTS_COUNT_KEY = 'blog:count:{version}:{scope}'
+
+PAGE_KEY = 'blog:page:{generations}:{path}:{page}'
+
+SITE_SCOPE = 'site'
+FEED_SCOPE = 'feed'
+
+
+def category_scope(slug):
+    return f'category:{slug}'
+
+
+def author_scope(author_id):
+    return f'author:{author_id}'
+
+
+def post_scope(pk):
+    return f'post:{pk}'
+
+
+def bump_page_scopes(*scopes):
+    for scope in scopes:
+        bump_version('page', scope)
+
+
+def bump_post_pages(post_id, category_ids=None):
+    if category_ids is None:
+        categories = Category.objects.filter(posts__pk=post_id)
+    else:
+        categories = Category.objects.filter(
+            pk__in=[pk for pk in category_ids if pk is not None]
+        )
+    slugs = categories.values_list('slug', flat=True)
+    bump_page_scopes(
+        FEED_SCOPE,
+        post_scope(post_id),
+        *(category_scope(slug) for slug in slugs),
+    )
+
+
+def posts_count_key(scope):
+    keys = [read_version_key(), version_key('count', 'posts')]
+    versions = get_versions(keys)
+    return POSTS_COUNT_KEY.format(
+        version='.'.join(versions[key] for key in keys), scope=scope
+    )
+
+
+def invalidate_post(post_id):
+    bump_version('blog.post', post_id)
+    bump_post_pages(post_id)
+
+
+def invalidate_posts(post_ids):
+    """Invalidate cards, counts and every cached page after a bulk change."""
+    bump_versions('blog.post', post_ids)
+    bump_version('count', 'posts')
+    bump_page_scopes(SITE_SCOPE)
+
+
+def page_cache_key(scopes, path, page):
+    keys = [read_version_key()] + [
+        version_key('page', scope) for scope in (SITE_SCOPE, *scopes)
+    ]
+    versions = get_versions(keys)
+    return PAGE_KEY.format(
+        generations='.'.join(versions[key] for key in keys),
+        path=md5(path.encode()).hexdigest(),
+        page=page,
+    )
+
+
+def invalidate_published_posts(post_ids):
+    """Invalidate the pages that start showing newly visible posts.
+
+    Only the feeds, the posts' categories and the posts themselves list
+    them, so the rest of the page cache stays warm.
+    """
+    bump_versions('blog.post', post_ids)
+    bump_version('count', 'posts')
+    slugs = Category.objects.filter(
+        posts__pk__in=post_ids
+    ).values_list('slug', flat=True).distinct()
+    bump_versions('page', [
+        FEED_SCOPE,
+        *(post_scope(pk) for pk in post_ids),
+        *(category_scope(slug) for slug in slugs),
+    ])
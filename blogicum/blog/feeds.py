@@ -0,0 +1,182 @@
+"""RSS and Atom feeds of the main feed, categories and authors.
+
+Feeds are built on the querysets of the matching HTML lists. Responses
+carry Last-Modified from the newest visible post and an ETag that also
+follows the page cache generations, so edits change it as well; pollers
+with a fresh copy get 304 after a single query. Rendered bodies are
+cached under the same generations.
+"""
+from copy import copy
+from hashlib import md5
+
+from django.contrib.auth import get_user_model
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import http_date, quote_etag
+
+from . import mixins, views
+from .caching import (
+    FEED_SCOPE,
+    PAGE_CACHE_TIMEOUT,
+    category_scope,
+    page_cache_key
+)
+from .models import Category
+
+
+FEED_SIZE = 20
+
+User = get_user_model()
+
+
+class PostFeed(Feed):
+    """Newest visible posts of the whole blog."""
+
+    title = 'Блогикум'
+    description = 'Новые публикации'
+    view_class = views.PostListView
+
+    def link(self, obj):
+        return reverse('blog:index')
+
+    def get_view_kwargs(self, obj):
+        return {}
+
+    def get_queryset(self, obj):
+        view = self.view_class()
+        view.setup(self.request, **self.get_view_kwargs(obj))
+        return view.get_queryset()
+
+    def get_cache_scopes(self, obj):
+        return (FEED_SCOPE,)
+
+    def items(self, obj):
+        return self.get_queryset(obj).order_by('-pub_date', '-id')[
+            :FEED_SIZE
+        ]
+
+    def item_title(self, post):
+        return post.title
+
+    def item_description(self, post):
+        return post.text
+
+    def item_pubdate(self, post):
+        return post.pub_date
+
+    def item_author_name(self, post):
+        return post.author.get_full_name() or post.author.username
+
+    def item_categories(self, post):
+        return (post.category.title,) if post.category else ()
+
+    def get_last_modified(self, obj):
+        return self.get_queryset(obj).order_by('-pub_date').values_list(
+            'pub_date', flat=True
+        ).first()
+
+    def __call__(self, request, *args, **kwargs):
+        # Instances are shared between requests; the view querysets need
+        # the current one.
+        feed = copy(self)
+        feed.request = request
+        return feed.respond(request, *args, **kwargs)
+
+    def respond(self, request, *args, **kwargs):
+        obj = self.get_object(request, *args, **kwargs)
+        last_modified = self.get_last_modified(obj)
+        key = page_cache_key(
+            self.get_cache_scopes(obj),
+            request.path,
+            last_modified.isoformat() if last_modified else '',
+        )
+        etag = quote_etag(md5(key.encode()).hexdigest())
+        timestamp = last_modified and int(last_modified.timestamp())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp
+        )
+        if response is not None:
+            return response
+
+        response = cache.get(key)
+        if response is None:
+            feed = self.get_feed(obj, request)
+            response = HttpResponse(content_type=feed.content_type)
+            feed.write(response, 'utf-8')
+            response['ETag'] = etag
+            if timestamp:
+                response['Last-Modified'] = http_date(timestamp)
+            cache.set(key, response, PAGE_CACHE_TIMEOUT)
+        return response
+
+
+class CategoryPostFeed(PostFeed):
+    view_class = views.CategoryPostListView
+
+    def get_object(self, request, category_slug):
+        return get_object_or_404(
+            Category.objects.filter(is_published=True), slug=category_slug
+        )
+
+    def title(self, category):
+        return f'Блогикум: {category.title}'
+
+    def description(self, category):
+        return category.description
+
+    def link(self, category):
+        return reverse('blog:category_posts', args=(category.slug,))
+
+    def get_view_kwargs(self, category):
+        return {'category_slug': category.slug}
+
+    def get_cache_scopes(self, category):
+        return (category_scope(category.slug),)
+
+
+class AuthorPostFeed(PostFeed):
+    # Author pages have no page cache scope of their own; every post
+    # change bumps the feed scope.
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, author):
+        return f'Блогикум: {author.get_full_name() or author.username}'
+
+    def description(self, author):
+        return f'Публикации пользователя {author.username}'
+
+    def link(self, author):
+        return reverse('blog:profile', args=(author.username,))
+
+    def get_queryset(self, author):
+        # The profile page also lists the author's hidden posts to the
+        # author; a feed is public, so only the visible branch applies.
+        return mixins.ValidPostQueryMixin().get_queryset().filter(
+            author=author
+        )
+
+
+class AtomFeedMixin:
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self._get_dynamic_attr('description', obj)
+
+
+class PostAtomFeed(AtomFeedMixin, PostFeed):
+    pass
+
+
+class CategoryPostAtomFeed(AtomFeedMixin, CategoryPostFeed):
+    pass
+
+
+class AuthorPostAtomFeed(AtomFeedMixin, AuthorPostFeed):
+    pass
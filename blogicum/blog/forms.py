@@ -1,7 +1,11 @@
 from django.contrib.auth import get_user_model
-from django.forms import ModelForm, DateTimeInput
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import UploadedFile
+from django.forms import DateTimeInput, Form, ModelChoiceField, ModelForm
+from PIL import UnidentifiedImageError
 
-from .models import Post, Comment
+from .images import normalize_image
+from .models import Category, Post, Comment
 
 
 User = get_user_model()
@@ -18,6 +22,15 @@ class PostForm(ModelForm):
             )
         }
 
+    def clean_image(self):
+        image = self.cleaned_data.get('image')
+        if not isinstance(image, UploadedFile):
+            return image
+        try:
+            return normalize_image(image)
+        except (OSError, UnidentifiedImageError):
+            raise ValidationError('Не удалось обработать изображение.')
+
 
 class CommentForm(ModelForm):
     class Meta:
@@ -29,3 +42,7 @@ class UserProfileChangeForm(ModelForm):
     class Meta:
         model = User
         fields = ['username', 'first_name', 'last_name', 'email']
+
+
+class PostCategoryForm(Form):
+    category = ModelChoiceField(Category.objects.all(), label='Категория')
@@ -0,0 +1,224 @@
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connections, transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+try:
+    import pillow_avif  # noqa: F401
+except ImportError:
+    pass
+
+
+MAX_IMAGE_SIZE = (2560, 2560)
+
+RENDITION_WIDTHS = (320, 640, 1280)
+RENDITIONS_DIR = 'renditions'
+RENDITIONS_CACHE_KEY = 'blog:image-renditions:{name}'
+RENDITIONS_CACHE_TIMEOUT = 60 * 60 * 24
+
+MODERN_FORMATS = {
+    'AVIF': ('image/avif', '.avif'),
+    'WEBP': ('image/webp', '.webp'),
+}
+
+SAVE_OPTIONS = {
+    'JPEG': {'quality': 85, 'optimize': True, 'progressive': True},
+    'PNG': {'optimize': True},
+    'WEBP': {'quality': 80, 'method': 6},
+    'AVIF': {'quality': 60},
+}
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_in_progress = set()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'POST_IMAGE_WORKERS', 2),
+            thread_name_prefix='post-images',
+        )
+    return _executor
+
+
+def get_modern_formats():
+    """Return the modern formats the installed Pillow can encode."""
+    Image.init()
+    return [
+        image_format for image_format in MODERN_FORMATS
+        if image_format in Image.SAVE
+    ]
+
+
+def rendition_name(name, width=None, image_format=None):
+    """Name of a copy, in a directory only this pipeline writes to.
+
+    The directory is named after the whole original name, so copies of
+    `a.jpg` never collide with an uploaded `a.webp` or its copies.
+    """
+    directory, basename = posixpath.split(name)
+    extension = posixpath.splitext(basename)[1]
+    if image_format in MODERN_FORMATS:
+        extension = MODERN_FORMATS[image_format][1]
+    return posixpath.join(
+        directory, RENDITIONS_DIR, basename,
+        f'{width}w{extension}' if width else f'full{extension}',
+    )
+
+
+def save_image(image, file, image_format):
+    if image_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    elif image_format in MODERN_FORMATS and image.mode not in ('RGB', 'RGBA'):
+        has_alpha = 'A' in image.mode or 'transparency' in image.info
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+    image.save(file, image_format, **SAVE_OPTIONS.get(image_format, {}))
+
+
+def normalize_image(upload):
+    """Re-encode an uploaded image without metadata and within the limits.
+
+    Formats without save options (GIF and the like) are returned as is,
+    as are files this function has already produced.
+    """
+    if getattr(upload, 'is_normalized', False):
+        return upload
+    upload.seek(0)
+    image = Image.open(upload)
+    image_format = image.format
+    if image_format not in SAVE_OPTIONS:
+        upload.seek(0)
+        return upload
+    image = ImageOps.exif_transpose(image)
+    image.thumbnail(MAX_IMAGE_SIZE, Image.Resampling.LANCZOS)
+    image.info = {
+        key: value for key, value in image.info.items()
+        if key in ('icc_profile', 'transparency')
+    }
+    content = BytesIO()
+    save_image(image, content, image_format)
+    normalized = SimpleUploadedFile(
+        upload.name, content.getvalue(), Image.MIME.get(image_format)
+    )
+    normalized.is_normalized = True
+    return normalized
+
+
+def generate_renditions(name, storage=default_storage):
+    """Write downscaled and modern-format copies of an image."""
+    try:
+        with storage.open(name) as file:
+            original = Image.open(file)
+            original.load()
+    except (OSError, UnidentifiedImageError):
+        logger.warning('Не удалось открыть изображение %s', name)
+        cache.set(RENDITIONS_CACHE_KEY.format(name=name), False,
+                  RENDITIONS_CACHE_TIMEOUT)
+        return None
+
+    image_format = original.format or 'JPEG'
+    formats = get_modern_formats()
+    widths = [width for width in RENDITION_WIDTHS if width < original.width]
+    for width in (*widths, None):
+        targets = [
+            (modern_format, rendition_name(name, width, modern_format))
+            for modern_format in formats
+        ]
+        if width is not None:
+            targets.append((image_format, rendition_name(name, width)))
+        targets = [
+            (target_format, target) for target_format, target in targets
+            if not storage.exists(target)
+        ]
+        if not targets:
+            continue
+        image = original
+        if width is not None:
+            height = round(original.height * width / original.width)
+            image = original.resize((width, height), Image.Resampling.LANCZOS)
+        for target_format, target in targets:
+            content = ContentFile(b'')
+            save_image(image, content, target_format)
+            storage.save(target, content)
+
+    variants = {'width': original.width, 'widths': widths, 'formats': formats}
+    cache.set(RENDITIONS_CACHE_KEY.format(name=name), variants,
+              RENDITIONS_CACHE_TIMEOUT)
+    return variants
+
+
+def _generate(name, callback):
+    try:
+        generate_renditions(name)
+        if callback is not None:
+            callback()
+    except Exception:
+        logger.exception('Не удалось подготовить копии изображения %s', name)
+    finally:
+        _in_progress.discard(name)
+
+
+def _generate_in_worker(name, callback):
+    try:
+        _generate(name, callback)
+    finally:
+        connections.close_all()
+
+
+def schedule_renditions(name, callback=None):
+    """Generate renditions after commit, in the worker pool if enabled."""
+    if not name:
+        return
+
+    def submit():
+        if name in _in_progress:
+            return
+        _in_progress.add(name)
+        if getattr(settings, 'POST_IMAGE_ASYNC', True):
+            get_executor().submit(_generate_in_worker, name, callback)
+        else:
+            _generate(name, callback)
+
+    transaction.on_commit(submit)
+
+
+def get_variants(name, on_ready=None):
+    """Return the description of the ready copies or None if not ready."""
+    variants = cache.get(RENDITIONS_CACHE_KEY.format(name=name))
+    if variants is None:
+        schedule_renditions(name, on_ready)
+    return variants or None
+
+
+def get_srcset(name, variants, image_format=None):
+    candidates = [
+        (width, rendition_name(name, width, image_format))
+        for width in variants['widths']
+    ]
+    candidates.append(
+        (variants['width'], rendition_name(name, None, image_format))
+    )
+    return ', '.join(
+        f'{default_storage.url(candidate)} {width}w'
+        for width, candidate in candidates
+    )
+
+
+def get_sources(name, variants):
+    """Return (mime type, srcset) pairs of the modern-format copies."""
+    return [
+        (MODERN_FORMATS[image_format][0],
+         get_srcset(name, variants, image_format))
+        for image_format in variants['formats']
+    ]
@@ -0,0 +1,110 @@
+import json
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+
+from blog import benchmark
+
+
+class Command(BaseCommand):
+    help = ('Заполняет базу синтетическими данными и замеряет количество '
+            'запросов, задержку и размер ответа для всех адресов блога.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=10000,
+                            help='Количество публикаций.')
+        parser.add_argument('--comments-per-post', type=int, default=3)
+        parser.add_argument('--repeat', type=int, default=20,
+                            help='Количество замеров на каждый адрес.')
+        parser.add_argument('--cold', action='store_true',
+                            help='Очищать кеш перед каждым запросом.')
+        parser.add_argument('--output', help='Файл для результатов в JSON.')
+        parser.add_argument('--compare',
+                            help='JSON предыдущего запуска для сравнения.')
+        parser.add_argument('--current-db', action='store_true',
+                            help='Использовать текущую базу данных вместо '
+                                 'временной тестовой.')
+        parser.add_argument('--keepdb', action='store_true',
+                            help='Не удалять временную базу данных.')
+        parser.add_argument('--mixed', action='store_true',
+                            help='Замерить пропускную способность при '
+                                 'одновременных чтении и записи для '
+                                 'настроек соединения по умолчанию и '
+                                 'текущих.')
+        parser.add_argument('--threads', type=int, default=8,
+                            help='Количество потоков в смешанной нагрузке.')
+        parser.add_argument('--mixed-requests', type=int, default=50,
+                            help='Количество запросов каждого потока.')
+        parser.add_argument('--write-share', type=float, default=0.2,
+                            help='Доля запросов на запись.')
+
+    def handle(self, *args, **options):
+        old_name = None
+        if not options['current_db']:
+            old_name = connection.settings_dict['NAME']
+            test_settings = connection.settings_dict['TEST']
+            if (options['mixed'] and connection.vendor == 'sqlite'
+                    and not test_settings['NAME']):
+                # Threads of an in-memory database share one cache and
+                # lock whole tables, which says nothing about the file.
+                test_settings['NAME'] = str(
+                    Path(tempfile.gettempdir()) / 'blogicum_benchmark.sqlite3'
+                )
+            connection.creation.create_test_db(
+                verbosity=0, autoclobber=True, keepdb=options['keepdb']
+            )
+        try:
+            with override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']
+            ):
+                report = self.benchmark(options)
+        finally:
+            if old_name is not None:
+                connection.creation.destroy_test_db(
+                    old_name, verbosity=0, keepdb=options['keepdb']
+                )
+
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                file.write(output)
+        else:
+            self.stdout.write(output)
+
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as file:
+                previous = json.load(file)
+            for change in benchmark.compare(previous, report):
+                self.stdout.write('{} [{}] {}: {} -> {}'.format(*change))
+
+    def benchmark(self, options):
+        self.stderr.write(f'Заполнение базы: {options["posts"]} публикаций')
+        benchmark.seed(
+            options['posts'],
+            comments_per_post=options['comments_per_post'],
+        )
+        self.stderr.write('Замеры...')
+        results = benchmark.run(options['repeat'], cold=options['cold'])
+        report = {
+            'meta': benchmark.get_meta(
+                repeat=options['repeat'], cold=options['cold']
+            ),
+            'results': results,
+        }
+        if options['mixed']:
+            self.stderr.write('Смешанная нагрузка...')
+            report['mixed'] = benchmark.run_mixed(
+                options['threads'],
+                options['mixed_requests'],
+                options['write_share'],
+            )
+            for result in report['mixed']:
+                self.stderr.write(
+                    '{profile}: {throughput_rps} запросов/с, '
+                    'p95 {p95_ms} мс, ошибок {errors}'.format(**result)
+                )
+        return report
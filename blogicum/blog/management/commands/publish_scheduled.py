@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from blog.scheduler import Ticker, publish_due
+from core.caches import get_process_local_warning
+
+
+class Command(BaseCommand):
+    help = ('Показывает на сайте отложенные публикации, время которых '
+            'наступило. С --watch работает постоянно и публикует их '
+            'точно в срок.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--watch', action='store_true',
+            help='Не завершаться и ждать следующих публикаций.',
+        )
+
+    def handle(self, *args, **options):
+        warning = get_process_local_warning()
+        if warning:
+            self.stderr.write(self.style.WARNING(warning))
+        if options['watch']:
+            try:
+                Ticker().run()
+            except KeyboardInterrupt:
+                pass
+            return
+        published = publish_due()
+        self.stdout.write(self.style.SUCCESS(
+            f'Опубликовано отложенных публикаций: {len(published)}'
+        ))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.models import Comment, Post
+from blog.search import COMMENT_INDEX, POST_INDEX
+
+
+class Command(BaseCommand):
+    help = 'Заново строит поисковые индексы публикаций и комментариев.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            posts = POST_INDEX.rebuild(Post)
+            comments = COMMENT_INDEX.rebuild(Comment)
+        self.stdout.write(self.style.SUCCESS(
+            f'Проиндексировано публикаций: {posts}, комментариев: {comments}'
+        ))
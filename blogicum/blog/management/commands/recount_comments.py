@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.models import Post
+from blog.moderation import count_comments
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает количество комментариев у всех публикаций.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = Post.objects.update(comments_count=count_comments())
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено публикаций: {updated}')
+        )
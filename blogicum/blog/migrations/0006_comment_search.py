@@ -0,0 +1,25 @@
+from django.db import migrations
+
+from blog import search
+
+
+def create_search_index(apps, schema_editor):
+    search.COMMENT_INDEX.create(schema_editor)
+    search.COMMENT_INDEX.rebuild(
+        apps.get_model('blog', 'Comment'), schema_editor.connection.alias
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    search.COMMENT_INDEX.drop(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_post_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
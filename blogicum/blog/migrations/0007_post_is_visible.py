@@ -0,0 +1,57 @@
+# Generated by Django 3.2.16 on 2026-10-18 21:20
+
+from django.db import migrations, models
+from django.db.models.functions import Now
+
+
+def set_visibility(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    Category = apps.get_model('blog', 'Category')
+    Post.objects.using(schema_editor.connection.alias).update(
+        is_visible=models.Case(
+            models.When(
+                models.Q(is_published=True, pub_date__lte=Now())
+                & models.Q(models.Exists(Category.objects.filter(
+                    pk=models.OuterRef('category_id'), is_published=True
+                ))),
+                then=models.Value(True),
+            ),
+            default=models.Value(False),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_comment_search'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='post',
+            name='post_published_pub_date_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='post',
+            name='post_category_pub_date_idx',
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='is_visible',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Виден на сайте'),
+        ),
+        migrations.RunPython(set_visibility, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_visible', True)), fields=['-pub_date', '-id'], name='post_visible_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_visible', True)), fields=['category', '-pub_date', '-id'], name='post_visible_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_published', True), ('is_visible', False)), fields=['pub_date'], name='post_scheduled_pub_date_idx'),
+        ),
+    ]
@@ -1,13 +1,28 @@
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.shortcuts import get_object_or_404, redirect
+from django.core.cache import cache
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from django.http import Http404
+from django.shortcuts import redirect
 from django.views.generic import ListView
 from django.urls import reverse
-from django.utils import timezone
 
+from .caching import (
+    PAGE_CACHE_TIMEOUT,
+    POST_CARD_CACHE_TIMEOUT,
+    page_cache_key,
+    posts_count_key,
+    set_post_card_versions
+)
 from .models import Post
+from .paginators import CachedCountPaginator, CursorPaginator
 
 
 SHOW_POSTS_PAGINATION = 10
+SHOW_COMMENTS_PAGINATION = 20
+
+COMMENTS_ORDERING = ('created_at', 'id')
 
 
 class PostQueryMixin:
@@ -28,13 +43,20 @@ class SuccessRedirectProfileMixin:
 
 
 class ValidPostQueryMixin(PostQueryMixin):
+    @classmethod
+    def valid_q(cls):
+        return Q(is_visible=True)
+
+    @classmethod
+    def visible_to_q(cls, user):
+        visible = cls.valid_q()
+        if user.is_authenticated:
+            visible |= Q(author=user)
+        return visible
+
     @classmethod
     def valid_filters(cls, queryset):
-        queryset = queryset.filter(
-            pub_date__lte=timezone.now(),
-            is_published=True,
-            category__is_published=True,
-        )
+        queryset = queryset.filter(cls.valid_q())
         return queryset
 
     def get_queryset(self):
@@ -43,7 +65,65 @@ class ValidPostQueryMixin(PostQueryMixin):
         return queryset
 
 
-class PostAuthorRequredMixin(LoginRequiredMixin):
+class ReplicaReadMixin:
+    """Serve safe requests from a read replica, see core.routers."""
+
+    use_replica = True
+
+
+class AnonymousPageCacheMixin:
+    page_cache_query_params = {'page'}
+
+    def get_page_cache_scopes(self):
+        return ()
+
+    def is_page_cacheable(self, request):
+        return (
+            request.method in ('GET', 'HEAD')
+            and settings.SESSION_COOKIE_NAME not in request.COOKIES
+            and not request.user.is_authenticated
+            and set(request.GET) <= self.page_cache_query_params
+        )
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.is_page_cacheable(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        key = page_cache_key(
+            self.get_page_cache_scopes(),
+            request.path,
+            request.GET.get('page', ''),
+        )
+        response = cache.get(key)
+        if response is not None:
+            return response
+
+        response = super().dispatch(request, *args, **kwargs)
+        if (response.status_code == 200
+                and hasattr(response, 'add_post_render_callback')):
+            response.add_post_render_callback(
+                lambda response: cache.set(key, response, PAGE_CACHE_TIMEOUT)
+            )
+        return response
+
+
+class SingleObjectMemoMixin:
+    related_fields = ('author',)
+
+    def get_queryset(self):
+        return super().get_queryset().select_related(*self.related_fields)
+
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, '_object'):
+            self._object = super().get_object()
+        return self._object
+
+
+class PostAuthorRequredMixin(SingleObjectMemoMixin, LoginRequiredMixin):
+    related_fields = ('author', 'location')
+
     def dispatch(self, request, *args, **kwargs):
         if self.get_object().author != request.user:
             return redirect(
@@ -52,14 +132,66 @@ class PostAuthorRequredMixin(LoginRequiredMixin):
         return super().dispatch(request, *args, **kwargs)
 
 
-class CommentAuthorRequredMixin(LoginRequiredMixin):
+class CommentAuthorRequredMixin(SingleObjectMemoMixin, LoginRequiredMixin):
+    def get_queryset(self):
+        return super().get_queryset().filter(author=self.request.user)
+
     def dispatch(self, request, *args, **kwargs):
-        comment_id = kwargs[self.pk_url_kwarg]
         if request.user.is_authenticated:
-            get_object_or_404(request.user.comments, pk=comment_id)
+            self.get_object()
         return super().dispatch(request, *args, **kwargs)
 
 
-class PostListMixin(ListView):
+class CursorPaginationMixin:
+    cursor_pagination = True
+    cursor_kwarg = 'cursor'
+    cursor_ordering = ('-pub_date', '-id')
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.cursor_pagination:
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size, self.cursor_ordering)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidPage as error:
+            raise Http404(str(error))
+        page.first_querystring = self.get_cursor_querystring(None)
+        page.next_querystring = self.get_cursor_querystring(page.next_cursor)
+        page.previous_querystring = self.get_cursor_querystring(
+            page.previous_cursor
+        )
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    def get_cursor_querystring(self, cursor):
+        query = self.request.GET.copy()
+        query[self.cursor_kwarg] = cursor or ''
+        return query.urlencode()
+
+
+class PostListMixin(CursorPaginationMixin, ListView):
     model = Post
     paginate_by = SHOW_POSTS_PAGINATION
+    paginator_class = CachedCountPaginator
+    cursor_pagination = False
+
+    def get_count_scope(self):
+        return None
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        scope = self.get_count_scope()
+        return super().get_paginator(
+            queryset,
+            per_page,
+            count_key=posts_count_key(scope) if scope else None,
+            **kwargs
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        if not self.cursor_pagination:
+            context['page_range'] = context['paginator'].get_window(
+                context['page_obj'].number
+            )
+        set_post_card_versions(context['page_obj'])
+        context['post_card_cache_timeout'] = POST_CARD_CACHE_TIMEOUT
+        return context
@@ -1,6 +1,8 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models.functions import Now
 from django.urls import reverse
+from django.utils import timezone
 
 from core.models import IspublishedInfoModel, PubDateInfoModel
 
@@ -14,6 +16,8 @@ LOCATION_STR_OUTPUT_LIMIT = 10
 POST_TITLE_MAX_LENGTH = 256
 POST_STR_OUTPUT_LIMIT = 10
 
+POST_VISIBILITY_FIELDS = {'is_published', 'pub_date', 'category'}
+
 COMMENT_STR_OUTPUT_LIMIT = 15
 
 User = get_user_model()
@@ -50,6 +54,21 @@ class Location(IspublishedInfoModel, PubDateInfoModel):
         return self.name[:LOCATION_STR_OUTPUT_LIMIT]
 
 
+class PostQuerySet(models.QuerySet):
+    def refresh_visibility(self):
+        """Recompute `is_visible` of the selected posts in one UPDATE."""
+        return self.update(is_visible=models.Case(
+            models.When(
+                models.Q(is_published=True, pub_date__lte=Now())
+                & models.Q(models.Exists(Category.objects.filter(
+                    pk=models.OuterRef('category_id'), is_published=True
+                ))),
+                then=models.Value(True),
+            ),
+            default=models.Value(False),
+        ))
+
+
 class Post(IspublishedInfoModel, PubDateInfoModel):
     pub_date_help_text = ('Если установить дату и время в будущем '
                           '— можно делать отложенные публикации.')
@@ -74,6 +93,17 @@ class Post(IspublishedInfoModel, PubDateInfoModel):
     image = models.ImageField('Изображение',
                               upload_to='post_image',
                               blank=True)
+    comments_count = models.PositiveIntegerField('Количество комментариев',
+                                                 default=0,
+                                                 editable=False)
+    # Published, in a published category and past pub_date; kept up to
+    # date on save, by category and moderation changes and by the
+    # `publish_scheduled` command, so feeds filter on a single column.
+    is_visible = models.BooleanField('Виден на сайте',
+                                     default=False,
+                                     editable=False)
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'публикация'
@@ -81,14 +111,40 @@ class Post(IspublishedInfoModel, PubDateInfoModel):
         default_related_name = 'posts'
 
         ordering = ('-pub_date',)
-
-    @property
-    def comment_count(self):
-        return self.comments.count()
+        indexes = (
+            models.Index(fields=('-pub_date', '-id'),
+                         condition=models.Q(is_visible=True),
+                         name='post_visible_pub_date_idx'),
+            models.Index(fields=('category', '-pub_date', '-id'),
+                         condition=models.Q(is_visible=True),
+                         name='post_visible_category_idx'),
+            models.Index(fields=('pub_date',),
+                         condition=models.Q(is_published=True,
+                                            is_visible=False),
+                         name='post_scheduled_pub_date_idx'),
+            models.Index(fields=('author', '-pub_date', '-id'),
+                         name='post_author_pub_date_idx'),
+        )
 
     def get_absolute_url(self):
         return reverse('blog:post_detail', kwargs={'post_id': self.id})
 
+    def get_visibility(self):
+        return (
+            self.is_published
+            and self.pub_date <= timezone.now()
+            and self.category is not None
+            and self.category.is_published
+        )
+
+    def save(self, *args, update_fields=None, **kwargs):
+        self.is_visible = self.get_visibility()
+        if update_fields is not None and (
+            POST_VISIBILITY_FIELDS & set(update_fields)
+        ):
+            update_fields = {*update_fields, 'is_visible'}
+        super().save(*args, update_fields=update_fields, **kwargs)
+
     def __str__(self):
         return self.title[:POST_STR_OUTPUT_LIMIT]
 
@@ -110,6 +166,10 @@ class Comment(PubDateInfoModel):
         default_related_name = 'comments'
 
         ordering = ('created_at',)
+        indexes = (
+            models.Index(fields=('post', 'created_at', 'id'),
+                         name='comment_post_created_at_idx'),
+        )
 
     def get_absolute_url(self):
         return reverse('blog:post_detail', kwargs={'post_id': self.post.id})
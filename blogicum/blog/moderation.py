@@ -0,0 +1,114 @@
+"""Set-based moderation of large selections.
+
+Every operation walks the selection by primary key, runs one UPDATE or
+DELETE per chunk in its own transaction and yields the number of rows
+handled, so callers can report progress. No model signals are sent, so
+counters, the search index and caches are kept consistent here.
+"""
+from django.db import connections, transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from . import scheduler
+from .caching import (
+    SITE_SCOPE,
+    bump_page_scopes,
+    bump_version,
+    bump_versions,
+    invalidate_posts
+)
+from .models import Category, Comment, Post
+from .search import COMMENT_INDEX
+
+
+CHUNK_SIZE = 500
+
+
+def count_comments():
+    """Expression with the number of comments of the outer post."""
+    return Coalesce(Subquery(
+        Comment.objects.filter(
+            post=OuterRef('pk')
+        ).order_by().values('post').annotate(count=Count('pk')).values('count')
+    ), 0)
+
+
+def iter_id_chunks(queryset, chunk_size=CHUNK_SIZE):
+    ids = queryset.order_by('pk').values_list('pk', flat=True)
+    last_id = None
+    while True:
+        chunk = ids if last_id is None else ids.filter(pk__gt=last_id)
+        chunk = list(chunk[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1]
+
+
+def delete_rows(model, ids, using):
+    """DELETE rows by primary key without loading them or sending signals.
+
+    Only for models that no other table references; callers keep
+    counters, indexes and caches consistent themselves.
+    """
+    meta = model._meta
+    quote_name = connections[using].ops.quote_name
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {quote_name(meta.db_table)} '
+            f'WHERE {quote_name(meta.pk.column)} IN '
+            f'({", ".join(["%s"] * len(ids))})',
+            list(ids),
+        )
+
+
+def set_posts_published(queryset, is_published):
+    for ids in iter_id_chunks(queryset):
+        with transaction.atomic():
+            posts = Post.objects.filter(pk__in=ids)
+            posts.update(is_published=is_published)
+            posts.refresh_visibility()
+            invalidate_posts(ids)
+            scheduler.reschedule()
+        yield len(ids)
+
+
+def set_posts_category(queryset, category):
+    for ids in iter_id_chunks(queryset):
+        with transaction.atomic():
+            posts = Post.objects.filter(pk__in=ids)
+            posts.update(category=category)
+            posts.refresh_visibility()
+            invalidate_posts(ids)
+            scheduler.reschedule()
+        yield len(ids)
+
+
+def set_categories_published(queryset, is_published):
+    for ids in iter_id_chunks(queryset):
+        with transaction.atomic():
+            Category.objects.filter(pk__in=ids).update(
+                is_published=is_published
+            )
+            Post.objects.filter(category_id__in=ids).refresh_visibility()
+            bump_versions('blog.category', ids)
+            bump_version('count', 'posts')
+            bump_page_scopes(SITE_SCOPE)
+            scheduler.reschedule()
+        yield len(ids)
+
+
+def delete_comments(queryset):
+    for ids in iter_id_chunks(queryset):
+        with transaction.atomic():
+            comments = Comment.objects.filter(pk__in=ids)
+            post_ids = set(comments.values_list('post_id', flat=True))
+            # Nothing references comments, so the rows can be deleted
+            # without the collector loading them one by one.
+            delete_rows(Comment, ids, comments.db)
+            Post.objects.filter(pk__in=post_ids).update(
+                comments_count=count_comments()
+            )
+            COMMENT_INDEX.remove(ids, comments.db)
+            invalidate_posts(post_ids)
+        yield len(ids)
@@ -0,0 +1,199 @@
+from datetime import datetime
+from functools import reduce
+from operator import or_
+
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import InvalidPage, Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+
+CURSOR_SALT = 'blog.paginators.cursor'
+
+COUNT_CACHE_TIMEOUT = 60 * 5
+PAGE_RANGE_ON_EACH_SIDE = 2
+PAGE_RANGE_ON_ENDS = 1
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator whose total is read from the cache, not a live COUNT(*)."""
+
+    def __init__(self, object_list, per_page, count_key=None,
+                 count_timeout=COUNT_CACHE_TIMEOUT, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_key = count_key
+        self.count_timeout = count_timeout
+
+    @cached_property
+    def count(self):
+        if self.count_key is None:
+            return Paginator.count.func(self)
+        count = cache.get(self.count_key)
+        if count is None:
+            count = Paginator.count.func(self)
+            cache.set(self.count_key, count, self.count_timeout)
+        return count
+
+    def get_window(self, number):
+        return list(self.get_elided_page_range(
+            number,
+            on_each_side=PAGE_RANGE_ON_EACH_SIDE,
+            on_ends=PAGE_RANGE_ON_ENDS,
+        ))
+
+
+class LimitedCountPaginator(Paginator):
+    """Paginator that counts rows only up to the end of the next page.
+
+    Huge tables are never counted in full: the count is bounded by a
+    LIMIT subquery just past the requested page, which is enough to link
+    the next one, so every page stays reachable. A capped count is a
+    lower bound, see `count_is_capped`.
+    """
+
+    def __init__(self, object_list, per_page, orphans=0,
+                 allow_empty_first_page=True, page_number=1):
+        super().__init__(object_list, per_page, orphans,
+                         allow_empty_first_page)
+        self.count_limit = (max(page_number, 1) + 1) * int(per_page)
+
+    @cached_property
+    def count(self):
+        return self.object_list.order_by()[:self.count_limit].count()
+
+    @property
+    def count_is_capped(self):
+        return self.count >= self.count_limit
+
+
+class CursorPage:
+    def __init__(self, object_list, paginator,
+                 next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<Cursor page of {len(self.object_list)} items>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Keyset paginator without OFFSET and COUNT(*).
+
+    Pages are addressed by opaque signed tokens holding the ordering
+    values of the boundary item, so the ordering must be unique: end it
+    with the primary key.
+    """
+
+    def __init__(self, queryset, per_page, ordering=('-pub_date', '-id')):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+
+    def page(self, cursor=None):
+        direction, values = NEXT, None
+        if cursor:
+            direction, values = self.decode_cursor(cursor)
+
+        ordering = self.ordering
+        if direction == PREVIOUS:
+            ordering = tuple(self._reverse(field) for field in ordering)
+        queryset = self.queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self._after(ordering, values))
+        items = list(queryset[:self.per_page + 1])
+        has_more = len(items) > self.per_page
+        items = items[:self.per_page]
+
+        if direction == PREVIOUS:
+            if not items:
+                # Everything before the cursor is gone; show the start.
+                return self.page()
+            items.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+
+        return CursorPage(
+            items,
+            self,
+            next_cursor=(
+                self.encode_cursor(NEXT, items[-1]) if has_next else None
+            ),
+            previous_cursor=(
+                self.encode_cursor(PREVIOUS, items[0])
+                if has_previous and items else None
+            ),
+        )
+
+    def encode_cursor(self, direction, obj):
+        values = []
+        for field in self.ordering:
+            value = getattr(obj, field.lstrip('-'))
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            values.append(value)
+        return signing.dumps([direction, values], salt=CURSOR_SALT)
+
+    def decode_cursor(self, cursor):
+        try:
+            direction, values = signing.loads(cursor, salt=CURSOR_SALT)
+        except (signing.BadSignature, TypeError, ValueError):
+            raise InvalidPage('Неверный курсор страницы.')
+        if (direction not in (NEXT, PREVIOUS)
+                or not isinstance(values, list)
+                or len(values) != len(self.ordering)):
+            raise InvalidPage('Неверный курсор страницы.')
+        return direction, [
+            self._to_python(field.lstrip('-'), value)
+            for field, value in zip(self.ordering, values)
+        ]
+
+    def _to_python(self, name, value):
+        try:
+            field = self.queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return value
+        return field.to_python(value)
+
+    @staticmethod
+    def _reverse(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def _after(ordering, values):
+        conditions = []
+        for index, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            equal = {
+                previous.lstrip('-'): value
+                for previous, value in zip(ordering[:index], values)
+            }
+            equal[f'{name}__{lookup}'] = values[index]
+            conditions.append(Q(**equal))
+        return reduce(or_, conditions)
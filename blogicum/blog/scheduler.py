@@ -0,0 +1,188 @@
+"""Publication of future-dated posts at their pub_date.
+
+The ticker sleeps until the earliest scheduled post is due, then marks
+every due post visible, invalidates only the pages that list or show
+them and renders those pages for anonymous readers, so the first visitor
+after a publication is served from the page cache. Read paths and the
+page cache therefore never have to compare pub_date with the clock.
+
+The ticker runs in the web process, starting with its first request,
+unless `POST_SCHEDULER_TICKER` is off; then run it as
+`manage.py publish_scheduled --watch`. Publishing is idempotent, so
+several tickers may run at once.
+"""
+import logging
+import threading
+from io import BytesIO
+
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connections, transaction
+from django.db.models import Min
+from django.urls import reverse
+from django.utils import timezone
+
+from . import moderation
+from .caching import invalidate_published_posts
+from .models import Category, Post
+
+
+PRERENDER_LIMIT = 10
+
+logger = logging.getLogger(__name__)
+
+_handler = None
+_ticker = None
+_ticker_lock = threading.Lock()
+
+
+def scheduled_posts():
+    """Published posts waiting for their pub_date."""
+    return Post.objects.filter(
+        is_published=True, is_visible=False, category__is_published=True
+    )
+
+
+def get_next_due():
+    return scheduled_posts().aggregate(
+        next_due=Min('pub_date')
+    )['next_due']
+
+
+def get_prerender_host():
+    for host in settings.ALLOWED_HOSTS:
+        if host != '*':
+            return host.lstrip('.')
+    return 'localhost'
+
+
+def get_handler():
+    """Request handler with the project middleware, built once."""
+    global _handler
+    if _handler is None:
+        handler = BaseHandler()
+        handler.load_middleware()
+        _handler = handler
+    return _handler
+
+
+def make_request(path):
+    return WSGIRequest({
+        'REQUEST_METHOD': 'GET',
+        'SCRIPT_NAME': '',
+        'PATH_INFO': path,
+        'SERVER_NAME': get_prerender_host(),
+        'SERVER_PORT': '80',
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': BytesIO(),
+    })
+
+
+def prerender(post_ids):
+    """Fill the page cache with the pages new posts appear on.
+
+    The pages go through the project middleware like any anonymous
+    request, so they are cached under the keys real readers look up,
+    including the database the replica router picks for them. Request
+    signals are not sent, so the connections of other threads are left
+    alone.
+    """
+    slugs = Category.objects.filter(
+        posts__pk__in=post_ids
+    ).values_list('slug', flat=True).distinct()
+    paths = [
+        reverse('blog:index'),
+        *(reverse('blog:category_posts', args=(slug,)) for slug in slugs),
+        *(reverse('blog:post_detail', args=(pk,))
+          for pk in post_ids[:PRERENDER_LIMIT]),
+    ]
+    handler = get_handler()
+    for path in paths:
+        handler.get_response(make_request(path))
+
+
+def publish_due():
+    """Make due posts visible and refresh their pages; return their ids."""
+    due = scheduled_posts().filter(pub_date__lte=timezone.now())
+    published = []
+    for ids in moderation.iter_id_chunks(due):
+        with transaction.atomic():
+            Post.objects.filter(pk__in=ids, is_visible=False).update(
+                is_visible=True
+            )
+            invalidate_published_posts(ids)
+        published.extend(ids)
+    if published:
+        prerender(published)
+    return published
+
+
+class Ticker(threading.Thread):
+    """Thread publishing scheduled posts as soon as they are due."""
+
+    def __init__(self, max_sleep=None):
+        super().__init__(name='post-scheduler', daemon=True)
+        # Saves in other processes do not wake this ticker; the next due
+        # time is re-read at least this often.
+        self.max_sleep = max_sleep or settings.POST_SCHEDULER_MAX_SLEEP
+        self.wakeup = threading.Event()
+        self.stopped = False
+
+    def get_sleep(self):
+        next_due = get_next_due()
+        if next_due is None:
+            return self.max_sleep
+        delay = (next_due - timezone.now()).total_seconds()
+        return min(max(delay, 0), self.max_sleep)
+
+    def tick(self):
+        try:
+            published = publish_due()
+            if published:
+                logger.info('Опубликованы отложенные публикации: %s',
+                            published)
+            return self.get_sleep()
+        except Exception:
+            logger.exception('Не удалось опубликовать отложенные публикации')
+            return self.max_sleep
+        finally:
+            connections.close_all()
+
+    def run(self):
+        while not self.stopped:
+            self.wakeup.clear()
+            self.wakeup.wait(self.tick())
+
+    def stop(self):
+        self.stopped = True
+        self.wakeup.set()
+
+
+def start_ticker():
+    """Start the ticker of this process once."""
+    global _ticker
+    with _ticker_lock:
+        if _ticker is None:
+            _ticker = Ticker()
+            _ticker.start()
+    return _ticker
+
+
+def start_ticker_on_request(**kwargs):
+    if settings.POST_SCHEDULER_TICKER and _ticker is None:
+        start_ticker()
+
+
+def stop_ticker():
+    global _ticker
+    with _ticker_lock:
+        if _ticker is not None:
+            _ticker.stop()
+            _ticker = None
+
+
+def reschedule():
+    """Let the ticker re-read the next due time after the commit."""
+    if _ticker is not None:
+        transaction.on_commit(_ticker.wakeup.set)
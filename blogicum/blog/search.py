@@ -0,0 +1,164 @@
+"""Full-text search over posts and comments.
+
+On SQLite every index is an FTS5 table keyed by the object id that
+stores stemmed words, so Russian and English word forms match each
+other and results are ranked with bm25. Other backends fall back to
+unranked substring matching.
+"""
+import re
+import threading
+from functools import reduce
+from operator import or_
+
+import snowballstemmer
+from django.db import connections, router
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+
+MAX_QUERY_WORDS = 16
+REBUILD_BATCH_SIZE = 1000
+
+WORD_RE = re.compile(r'\w+')
+CYRILLIC_RE = re.compile('[а-я]')
+
+_stemmers = threading.local()
+
+
+def get_stemmer(language):
+    stemmer = getattr(_stemmers, language, None)
+    if stemmer is None:
+        stemmer = snowballstemmer.stemmer(language)
+        setattr(_stemmers, language, stemmer)
+    return stemmer
+
+
+def stem_words(text):
+    words = WORD_RE.findall(text.lower().replace('ё', 'е'))
+    return [
+        get_stemmer(
+            'russian' if CYRILLIC_RE.search(word) else 'english'
+        ).stemWord(word)
+        for word in words
+    ]
+
+
+def to_match_query(query):
+    """Build an FTS5 query requiring every stemmed word of the input."""
+    stems = dict.fromkeys(stem_words(query))
+    return ' '.join(f'"{stem}"' for stem in list(stems)[:MAX_QUERY_WORDS])
+
+
+def is_supported(using='default'):
+    return connections[using].vendor == 'sqlite'
+
+
+class FullTextIndex:
+    """FTS5 table over text fields of a model, weighted for ranking."""
+
+    def __init__(self, table, weights):
+        self.table = table
+        self.weights = dict(weights)
+
+    def create(self, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} '
+            f"USING fts5({', '.join(self.weights)}, tokenize = 'unicode61')"
+        )
+
+    def drop(self, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        schema_editor.execute(f'DROP TABLE IF EXISTS {self.table}')
+
+    def remove(self, ids, using='default'):
+        if not is_supported(using) or not ids:
+            return
+        with connections[using].cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {self.table} WHERE rowid = %s',
+                [(pk,) for pk in ids],
+            )
+
+    def update(self, objects, using='default'):
+        """Replace index rows of the objects with their current text."""
+        if not is_supported(using):
+            return
+        objects = list(objects)
+        self.remove([obj.pk for obj in objects], using)
+        columns = ', '.join(self.weights)
+        placeholders = ', '.join(['%s'] * (len(self.weights) + 1))
+        with connections[using].cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {self.table} (rowid, {columns}) '
+                f'VALUES ({placeholders})',
+                [
+                    (obj.pk, *(
+                        ' '.join(stem_words(getattr(obj, field)))
+                        for field in self.weights
+                    ))
+                    for obj in objects
+                ],
+            )
+
+    def rebuild(self, model, using=None):
+        """Index every object from scratch, e.g. after bulk imports."""
+        using = using or router.db_for_write(model)
+        if not is_supported(using):
+            return 0
+        with connections[using].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+        objects = model.objects.using(using).only('pk', *self.weights)
+        batch, indexed = [], 0
+        for obj in objects.iterator(chunk_size=REBUILD_BATCH_SIZE):
+            batch.append(obj)
+            if len(batch) == REBUILD_BATCH_SIZE:
+                self.update(batch, using)
+                indexed += len(batch)
+                batch = []
+        self.update(batch, using)
+        return indexed + len(batch)
+
+    def search(self, queryset, query):
+        """Filter objects matching the query and annotate them with `rank`.
+
+        A lower rank means a better match.
+        """
+        unranked = queryset.annotate(
+            rank=Value(0.0, output_field=FloatField())
+        )
+        if not is_supported(queryset.db):
+            words = WORD_RE.findall(query)[:MAX_QUERY_WORDS]
+            for word in words:
+                unranked = unranked.filter(reduce(or_, (
+                    Q(**{f'{field}__icontains': word})
+                    for field in self.weights
+                )))
+            return unranked if words else unranked.none()
+
+        match = to_match_query(query)
+        if not match:
+            return unranked.none()
+        meta = queryset.model._meta
+        weights = ', '.join(['%s'] * len(self.weights))
+        return queryset.extra(
+            tables=[self.table],
+            where=[
+                f'{self.table}.rowid = {meta.db_table}.{meta.pk.column}',
+                f'{self.table} MATCH %s',
+            ],
+            params=[match],
+        ).annotate(rank=RawSQL(
+            f'bm25({self.table}, {weights})', tuple(self.weights.values()),
+            output_field=FloatField(),
+        ))
+
+
+POST_INDEX = FullTextIndex('blog_post_search', {'title': 10.0, 'text': 1.0})
+COMMENT_INDEX = FullTextIndex('blog_comment_search', {'text': 1.0})
+
+
+def search(queryset, query):
+    return POST_INDEX.search(queryset, query)
@@ -0,0 +1,192 @@
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.db.models.signals import (
+    post_delete,
+    post_init,
+    post_save,
+    pre_save
+)
+from django.dispatch import receiver
+
+from core.signals import replica_synced
+
+from .caching import (
+    SITE_SCOPE,
+    bump_page_scopes,
+    bump_post_pages,
+    bump_version,
+    invalidate_post
+)
+from . import scheduler
+from .images import normalize_image, schedule_renditions
+from .models import Category, Comment, Location, Post
+from .search import COMMENT_INDEX, POST_INDEX
+
+
+SEARCH_INDEXES = {Post: POST_INDEX, Comment: COMMENT_INDEX}
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Comment)
+def increment_comments_count(sender, instance, created, raw, **kwargs):
+    if created and not raw:
+        Post.objects.filter(pk=instance.post_id).update(
+            comments_count=F('comments_count') + 1
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comments_count(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id, comments_count__gt=0).update(
+        comments_count=F('comments_count') - 1
+    )
+
+
+@receiver(post_init, sender=Comment)
+def remember_loaded_post(sender, instance, **kwargs):
+    instance._loaded_post_id = instance.__dict__.get('post_id')
+
+
+@receiver(post_save, sender=Comment)
+def move_comments_count(sender, instance, created, raw, **kwargs):
+    """Follow a comment moved to another post, e.g. in the admin."""
+    old_post_id = instance._loaded_post_id
+    instance._loaded_post_id = instance.post_id
+    if created or raw or old_post_id in (None, instance.post_id):
+        return
+    Post.objects.filter(pk=old_post_id, comments_count__gt=0).update(
+        comments_count=F('comments_count') - 1
+    )
+    Post.objects.filter(pk=instance.post_id).update(
+        comments_count=F('comments_count') + 1
+    )
+    invalidate_post(old_post_id)
+
+
+def is_login_update(update_fields):
+    return update_fields is not None and set(update_fields) == {'last_login'}
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Location)
+def bump_card_version(sender, instance, update_fields=None, **kwargs):
+    if not is_login_update(update_fields):
+        bump_version(instance._meta.label_lower, instance.pk)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def bump_commented_post_version(sender, instance, **kwargs):
+    bump_version(Post._meta.label_lower, instance.post_id)
+
+
+@receiver(post_init, sender=Category)
+def remember_loaded_publication(sender, instance, **kwargs):
+    instance._loaded_is_published = instance.__dict__.get('is_published')
+
+
+@receiver(post_save, sender=Category)
+def update_category_posts_visibility(sender, instance, created, raw,
+                                     **kwargs):
+    if not created and not raw and (
+        instance.is_published != instance._loaded_is_published
+    ):
+        Post.objects.filter(category=instance).refresh_visibility()
+        instance._loaded_is_published = instance.is_published
+
+
+@receiver(post_delete, sender=Category)
+def hide_uncategorized_posts(sender, instance, **kwargs):
+    # The posts of a deleted category are detached by SET_NULL, which
+    # does not save them.
+    Post.objects.filter(category=None, is_visible=True).update(
+        is_visible=False
+    )
+
+
+@receiver(post_init, sender=Post)
+def remember_loaded_values(sender, instance, **kwargs):
+    instance._loaded_category_id = instance.__dict__.get('category_id')
+    image = instance.__dict__.get('image')
+    instance._loaded_image = getattr(image, 'name', image)
+
+
+@receiver(pre_save, sender=Post)
+def normalize_uploaded_image(sender, instance, raw, **kwargs):
+    # Covers the admin and any other code path, not just PostForm; the
+    # form normalizes earlier only to report unreadable files.
+    image = instance.image
+    if not raw and image and not image._committed:
+        instance.image = normalize_image(image.file)
+
+
+@receiver(post_save, sender=Post)
+def prepare_image_renditions(sender, instance, raw, **kwargs):
+    if not raw and instance.image and (
+        instance.image.name != instance._loaded_image
+    ):
+        schedule_renditions(
+            instance.image.name, partial(invalidate_post, instance.pk)
+        )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Comment)
+def update_search_index(sender, instance, raw, using, update_fields=None,
+                        **kwargs):
+    index = SEARCH_INDEXES[sender]
+    if raw or update_fields and not set(index.weights) & set(update_fields):
+        return
+    index.update([instance], using)
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Comment)
+def remove_from_search_index(sender, instance, using, **kwargs):
+    SEARCH_INDEXES[sender].remove([instance.pk], using)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_pages(sender, instance, **kwargs):
+    bump_version('count', 'posts')
+    bump_post_pages(instance.pk, {
+        instance.category_id,
+        instance._loaded_category_id,
+    })
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_commented_post_pages(sender, instance, **kwargs):
+    bump_post_pages(instance.post_id)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Location)
+@receiver(post_delete, sender=User)
+def invalidate_site_pages(sender, instance, update_fields=None, **kwargs):
+    if not is_login_update(update_fields):
+        bump_page_scopes(SITE_SCOPE)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Category)
+def wake_scheduler(sender, instance, raw, **kwargs):
+    if not raw:
+        scheduler.reschedule()
+
+
+@receiver(replica_synced)
+def invalidate_replica_caches(sender, alias, **kwargs):
+    bump_version('db', alias)
@@ -0,0 +1,23 @@
+from functools import partial
+
+from django import template
+
+from blog.caching import invalidate_post
+from blog.images import get_sources, get_srcset, get_variants
+
+
+register = template.Library()
+
+POST_IMAGE_SIZES = '(max-width: 40rem) 100vw, 40rem'
+
+
+@register.inclusion_tag('includes/post_image.html')
+def post_image(post):
+    name = post.image.name
+    variants = get_variants(name, partial(invalidate_post, post.pk))
+    return {
+        'post': post,
+        'sizes': POST_IMAGE_SIZES,
+        'srcset': get_srcset(name, variants) if variants else '',
+        'sources': get_sources(name, variants) if variants else [],
+    }
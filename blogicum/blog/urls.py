@@ -1,6 +1,6 @@
 from django.urls import path
 
-from . import views
+from . import api, feeds, views
 
 
 app_name = 'blog'
@@ -27,6 +27,11 @@ urlpatterns = [
         views.PostDeleteView.as_view(),
         name='delete_post'
     ),
+    path(
+        'posts/<int:post_id>/comments/',
+        views.PostCommentListView.as_view(),
+        name='post_comments'
+    ),
     path(
         'posts/<int:post_id>/comment/',
         views.CommentCreateView.as_view(),
@@ -52,9 +57,58 @@ urlpatterns = [
         views.UserProfilePostListView.as_view(),
         name='profile'
     ),
+    path('feed/rss/', feeds.PostFeed(), name='feed_rss'),
+    path('feed/atom/', feeds.PostAtomFeed(), name='feed_atom'),
+    path(
+        'category/<slug:category_slug>/rss/',
+        feeds.CategoryPostFeed(),
+        name='category_feed_rss'
+    ),
+    path(
+        'category/<slug:category_slug>/atom/',
+        feeds.CategoryPostAtomFeed(),
+        name='category_feed_atom'
+    ),
+    path(
+        'profile/<str:username>/rss/',
+        feeds.AuthorPostFeed(),
+        name='profile_feed_rss'
+    ),
+    path(
+        'profile/<str:username>/atom/',
+        feeds.AuthorPostAtomFeed(),
+        name='profile_feed_atom'
+    ),
+    path('search/', views.PostSearchView.as_view(), name='search'),
     path(
         'category/<slug:category_slug>/',
         views.CategoryPostListView.as_view(),
         name='category_posts'
     ),
+    path('api/posts/', api.PostListApiView.as_view(), name='api_posts'),
+    path(
+        'api/posts/<int:post_id>/',
+        api.PostApiView.as_view(),
+        name='api_post'
+    ),
+    path(
+        'api/posts/<int:post_id>/comments/',
+        api.CommentListApiView.as_view(),
+        name='api_comments'
+    ),
+    path(
+        'api/categories/',
+        api.CategoryListApiView.as_view(),
+        name='api_categories'
+    ),
+    path(
+        'api/locations/',
+        api.LocationListApiView.as_view(),
+        name='api_locations'
+    ),
+    path(
+        'api/profiles/<str:username>/',
+        api.ProfileApiView.as_view(),
+        name='api_profile'
+    ),
 ]
@@ -1,8 +1,11 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import transaction
 from django.shortcuts import get_object_or_404
+from django.utils.decorators import method_decorator
 from django.views.generic import (
     DetailView,
+    ListView,
     UpdateView,
     DeleteView,
     CreateView
@@ -11,41 +14,88 @@ from django.urls import reverse
 
 from .forms import PostForm, UserProfileChangeForm, CommentForm
 from . import mixins
+from .caching import FEED_SCOPE, author_scope, category_scope, post_scope
 from .models import Post, Category, Comment
+from .paginators import CursorPaginator
+from .search import search
 
 
 User = get_user_model()
 
 
-class PostListView(mixins.ValidPostQueryMixin, mixins.PostListMixin):
+class PostListView(
+    mixins.ReplicaReadMixin,
+    mixins.AnonymousPageCacheMixin,
+    mixins.ValidPostQueryMixin,
+    mixins.PostListMixin
+):
     template_name = 'blog/index.html'
 
+    def get_page_cache_scopes(self):
+        return (FEED_SCOPE,)
+
+    def get_count_scope(self):
+        return FEED_SCOPE
+
 
-class PostDetailView(mixins.ValidPostQueryMixin, DetailView):
+class PostDetailView(
+    mixins.ReplicaReadMixin,
+    mixins.AnonymousPageCacheMixin,
+    mixins.ValidPostQueryMixin,
+    DetailView
+):
     template_name = 'blog/detail.html'
     model = Post
     pk_url_kwarg = 'post_id'
 
-    def get_object(self, queryset=None):
-        queryset = self.queryset
+    def get_page_cache_scopes(self):
+        return (post_scope(self.kwargs.get(self.pk_url_kwarg)),)
 
-        post = get_object_or_404(queryset,
+    def get_object(self, queryset=None):
+        queryset = self.queryset.filter(
+            self.visible_to_q(self.request.user)
+        )
+        return get_object_or_404(queryset,
                                  pk=self.kwargs.get(self.pk_url_kwarg))
-        if post.author != self.request.user:
-            queryset = self.get_queryset()
-            post = get_object_or_404(queryset,
-                                     pk=self.kwargs.get(self.pk_url_kwarg))
-        return post
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = self.object.comments.select_related(
-            'author'
-        ).all()
+        context['comments'] = CursorPaginator(
+            self.object.comments.select_related('author'),
+            mixins.SHOW_COMMENTS_PAGINATION,
+            mixins.COMMENTS_ORDERING,
+        ).page()
+        return context
+
+
+class PostCommentListView(
+    mixins.CursorPaginationMixin,
+    mixins.ValidPostQueryMixin,
+    ListView
+):
+    template_name = 'includes/comments_list.html'
+    context_object_name = 'comments'
+    paginate_by = mixins.SHOW_COMMENTS_PAGINATION
+    cursor_ordering = mixins.COMMENTS_ORDERING
+
+    def get_queryset(self):
+        self.commented_post = get_object_or_404(
+            Post.objects.filter(
+                self.visible_to_q(self.request.user)
+            ).only('id', 'author_id'),
+            pk=self.kwargs.get('post_id')
+        )
+        return self.commented_post.comments.select_related('author')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['post'] = self.commented_post
+        context['comments'] = context['page_obj']
         return context
 
 
+@method_decorator(transaction.atomic, name='dispatch')
 class CommentCreateView(LoginRequiredMixin, CreateView):
     model = Comment
     form_class = CommentForm
@@ -67,6 +117,7 @@ class CommentEditView(mixins.CommentAuthorRequredMixin, UpdateView):
     pk_url_kwarg = 'comment_id'
 
 
+@method_decorator(transaction.atomic, name='dispatch')
 class CommentDeleteView(mixins.CommentAuthorRequredMixin, DeleteView):
     template_name = 'blog/comment.html'
     model = Comment
@@ -110,9 +161,20 @@ class PostDeleteView(
     pk_url_kwarg = 'post_id'
 
 
-class CategoryPostListView(mixins.ValidPostQueryMixin, mixins.PostListMixin):
+class CategoryPostListView(
+    mixins.ReplicaReadMixin,
+    mixins.AnonymousPageCacheMixin,
+    mixins.ValidPostQueryMixin,
+    mixins.PostListMixin
+):
     template_name = 'blog/category.html'
 
+    def get_page_cache_scopes(self):
+        return (category_scope(self.kwargs.get('category_slug')),)
+
+    def get_count_scope(self):
+        return category_scope(self.kwargs.get('category_slug'))
+
     def get_queryset(self):
         queryset = super().get_queryset()
         queryset = queryset.filter(
@@ -130,24 +192,53 @@ class CategoryPostListView(mixins.ValidPostQueryMixin, mixins.PostListMixin):
         return context
 
 
-class UserProfilePostListView(mixins.PostQueryMixin, mixins.PostListMixin):
-    template_name = 'blog/profile.html'
+class PostSearchView(mixins.ValidPostQueryMixin, mixins.PostListMixin):
+    template_name = 'blog/search.html'
+    cursor_pagination = True
+    cursor_ordering = ('rank', '-id')
+    search_kwarg = 'q'
 
     def get_queryset(self):
-        user_profile_username = self.kwargs.get('username')
+        self.query = self.request.GET.get(self.search_kwarg, '').strip()
+        return search(super().get_queryset(), self.query)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.query
+        return context
 
-        queryset = super().get_queryset().filter(
-            author__username=user_profile_username
-        )
-        if self.request.user.username != user_profile_username:
-            queryset = mixins.ValidPostQueryMixin.valid_filters(queryset)
 
+class UserProfilePostListView(
+    mixins.ReplicaReadMixin,
+    mixins.PostQueryMixin,
+    mixins.PostListMixin
+):
+    template_name = 'blog/profile.html'
+
+    def get(self, request, *args, **kwargs):
+        # Resolved before any post query, so unknown users cost a single
+        # lookup and the posts are filtered by the indexed author_id.
+        self.profile = get_object_or_404(User, username=kwargs['username'])
+        return super().get(request, *args, **kwargs)
+
+    def is_own_profile(self):
+        return self.request.user.pk == self.profile.pk
+
+    def get_queryset(self):
+        queryset = super().get_queryset().filter(author_id=self.profile.pk)
+        if not self.is_own_profile():
+            queryset = mixins.ValidPostQueryMixin.valid_filters(queryset)
         return queryset
 
+    def get_count_scope(self):
+        scope = author_scope(self.profile.pk)
+        if self.is_own_profile():
+            scope = f'{scope}:own'
+        return scope
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        profile = get_object_or_404(User, username=self.kwargs.get('username'))
-        context['profile'] = profile
+        context['profile'] = self.profile
         return context
 
 
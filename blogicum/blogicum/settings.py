@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -42,6 +43,7 @@ INSTALLED_APPS = [
 
     'django_bootstrap5',
 
+    'core.apps.CoreConfig',
     'blog.apps.BlogConfig',
     'pages.apps.PagesConfig',
 ]
@@ -53,6 +55,7 @@ MIDDLEWARE = [
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'core.middleware.PrimaryReplicaMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
@@ -83,8 +86,63 @@ WSGI_APPLICATION = 'blogicum.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'core.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        'OPTIONS': {
+            'transaction_mode': os.environ.get(
+                'SQLITE_TRANSACTION_MODE', 'IMMEDIATE'
+            ),
+        },
+    }
+}
+
+# Read replicas: comma separated SQLite files kept in sync with the
+# primary, e.g. by `manage.py sync_replicas`. List and detail pages read
+# from them; writes and the requests of users who have just written use
+# the primary.
+REPLICA_DATABASES = []
+for index, name in enumerate(
+        filter(None, os.environ.get('SQLITE_REPLICAS', '').split(',')), 1
+):
+    REPLICA_DATABASES.append(f'replica{index}')
+    DATABASES[f'replica{index}'] = {
+        **DATABASES['default'],
+        'NAME': name.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['core.routers.PrimaryReplicaRouter']
+
+REPLICA_STICKY_COOKIE_NAME = 'primary_reads'
+REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 10))
+
+# Applied to every new SQLite connection by core; an empty value from the
+# environment leaves the SQLite default. WAL lets readers work alongside
+# a writer, and writers wait for the lock instead of failing at once.
+SQLITE_PRAGMAS = {
+    'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'wal'),
+    'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'normal'),
+    'busy_timeout': os.environ.get('SQLITE_BUSY_TIMEOUT', 5000),
+    'mmap_size': os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024),
+    # Negative values are KiB rather than pages.
+    'cache_size': os.environ.get('SQLITE_CACHE_SIZE', -20000),
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+# Pages, feeds and post cards are invalidated through version keys in
+# this cache, so every process serving or writing data must share it:
+# with several workers, `publish_scheduled --watch` or `sync_replicas`,
+# use e.g. FileBasedCache or PyMemcacheCache instead of the default.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
     }
 }
 
@@ -131,6 +189,12 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static_dev',
 ]
 
+STATIC_ROOT = BASE_DIR / 'static'
+
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+
+STATIC_CACHE_MAX_AGE = 60 * 60 * 24 * 365
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
 
@@ -144,6 +208,20 @@ LOGIN_URL = 'login'
 
 MEDIA_ROOT = BASE_DIR / 'media'
 MEDIA_URL = 'media/'
+MEDIA_CACHE_MAX_AGE = 60 * 60 * 24 * 365
+# 'X-Sendfile' (Apache, lighttpd) or 'X-Accel-Redirect' (nginx) hands
+# uploaded files off to the front server instead of reading them in Django.
+MEDIA_SENDFILE_HEADER = None
+MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+
+POST_IMAGE_ASYNC = True
+POST_IMAGE_WORKERS = 2
+
+# Scheduled posts are published by a thread of the web process. Set
+# POST_SCHEDULER_TICKER=0 when `manage.py publish_scheduled --watch` runs
+# next to it instead.
+POST_SCHEDULER_TICKER = os.environ.get('POST_SCHEDULER_TICKER', '1') == '1'
+POST_SCHEDULER_MAX_SLEEP = 60
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
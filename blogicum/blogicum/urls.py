@@ -1,10 +1,13 @@
+import re
+
 from django.contrib import admin
 from django.contrib.auth.forms import UserCreationForm
 from django.conf import settings
-from django.conf.urls.static import static
-from django.urls import include, path, reverse_lazy
+from django.urls import include, path, re_path, reverse_lazy
 from django.views.generic.edit import CreateView
 
+from core.views import serve_media, serve_static
+
 
 handler404 = 'pages.views.page_not_found'
 handler500 = 'pages.views.server_error'
@@ -25,4 +28,15 @@ urlpatterns = [
     path('auth/', include('django.contrib.auth.urls')),
 
     path('admin/', admin.site.urls),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
+    re_path(
+        r'^{}(?P<path>.+)$'.format(re.escape(settings.MEDIA_URL.lstrip('/'))),
+        serve_media,
+        name='media',
+    ),
+    re_path(
+        r'^{}(?P<path>.+)$'.format(re.escape(settings.STATIC_URL.lstrip('/'))),
+        serve_static,
+        name='static',
+    ),
+]
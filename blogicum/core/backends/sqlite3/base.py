@@ -0,0 +1,32 @@
+"""SQLite backend with a configurable transaction mode.
+
+`OPTIONS['transaction_mode']` follows the option of newer Django
+versions. With IMMEDIATE the write lock is taken at BEGIN, so a
+transaction that reads before writing waits for the busy timeout
+instead of failing with "database is locked" when it upgrades its lock.
+"""
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+
+TRANSACTION_MODES = ('DEFERRED', 'IMMEDIATE', 'EXCLUSIVE')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    @property
+    def transaction_mode(self):
+        mode = self.settings_dict['OPTIONS'].get('transaction_mode')
+        if mode and mode.upper() not in TRANSACTION_MODES:
+            raise ImproperlyConfigured(
+                f'Недопустимый режим транзакций SQLite: {mode!r}'
+            )
+        return mode.upper() if mode else None
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('transaction_mode', None)
+        return params
+
+    def _start_transaction_under_autocommit(self):
+        mode = self.transaction_mode
+        self.cursor().execute(f'BEGIN {mode}' if mode else 'BEGIN')
@@ -0,0 +1,23 @@
+"""Helpers for the cache that carries invalidation between processes."""
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+
+PROCESS_LOCAL_BACKENDS = (DummyCache, LocMemCache)
+
+PROCESS_LOCAL_CACHE_MESSAGE = (
+    'Кеш {alias!r} не разделяется между процессами: изменения, сделанные '
+    'в другом процессе, не сбросят кеш страниц, лент и карточек. Задайте '
+    'CACHE_BACKEND и CACHE_LOCATION.'
+)
+
+
+def is_process_local(alias=DEFAULT_CACHE_ALIAS):
+    return isinstance(caches[alias], PROCESS_LOCAL_BACKENDS)
+
+
+def get_process_local_warning(alias=DEFAULT_CACHE_ALIAS):
+    if is_process_local(alias):
+        return PROCESS_LOCAL_CACHE_MESSAGE.format(alias=alias)
+    return None
@@ -0,0 +1,12 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+from .caches import get_process_local_warning
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    message = get_process_local_warning()
+    if message is None or settings.DEBUG:
+        return []
+    return [Warning(message, id='core.W001')]
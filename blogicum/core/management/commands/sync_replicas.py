@@ -0,0 +1,36 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from core.caches import get_process_local_warning
+from core.signals import replica_synced
+
+
+class Command(BaseCommand):
+    help = ('Копирует основную базу SQLite в файлы реплик из '
+            'REPLICA_DATABASES.')
+
+    def handle(self, *args, **options):
+        primary = connections[DEFAULT_DB_ALIAS]
+        if primary.vendor != 'sqlite':
+            raise CommandError('Реплики поддерживаются только для SQLite.')
+        # Receivers of replica_synced bump cache versions; web processes
+        # only see them through a shared cache.
+        warning = get_process_local_warning()
+        if warning:
+            self.stderr.write(self.style.WARNING(warning))
+        primary.ensure_connection()
+        for alias in settings.REPLICA_DATABASES:
+            replica = connections[alias]
+            replica.close()
+            target = sqlite3.connect(str(replica.settings_dict['NAME']))
+            try:
+                primary.connection.backup(target)
+            finally:
+                target.close()
+            replica_synced.send(sender=self.__class__, alias=alias)
+            self.stdout.write(self.style.SUCCESS(
+                f'Реплика {alias} обновлена.'
+            ))
@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.urls import Resolver404, resolve
+
+from .routers import replica_reads
+
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+class PrimaryReplicaMiddleware:
+    """Route reads of replica views and keep writers on the primary.
+
+    A successful write sets a cookie for `REPLICA_STICKY_SECONDS`; while
+    it lives, the user's reads stay on the primary, so they see their own
+    changes regardless of replication lag.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if self.reads_from_replica(request):
+            with replica_reads():
+                response = self.get_response(request)
+        else:
+            response = self.get_response(request)
+
+        if (settings.REPLICA_DATABASES
+                and request.method not in SAFE_METHODS
+                and response.status_code < 400):
+            response.set_cookie(
+                settings.REPLICA_STICKY_COOKIE_NAME,
+                '1',
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+    def reads_from_replica(self, request):
+        if (not settings.REPLICA_DATABASES
+                or request.method not in SAFE_METHODS
+                or settings.REPLICA_STICKY_COOKIE_NAME in request.COOKIES):
+            return False
+        # The view is resolved again later by the handler; resolving is
+        # cached and cheap.
+        try:
+            match = resolve(
+                request.path_info, getattr(request, 'urlconf', None)
+            )
+        except Resolver404:
+            return False
+        view_class = getattr(match.func, 'view_class', None)
+        return getattr(view_class, 'use_replica', False)
@@ -0,0 +1,50 @@
+"""Primary/replica routing.
+
+Writes always go to the primary. Reads go to an alias of
+`REPLICA_DATABASES` only inside `replica_reads()`, which the middleware
+enters for views marked with `use_replica`; everything else, including
+the requests of users who have just written, reads from the primary.
+The replica is picked once per `replica_reads()` block, so all queries
+of a request and the cache keys built from the read alias agree.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+
+# Sessions are read on every request right after login, before any
+# replica could have caught up.
+PRIMARY_APPS = {'sessions'}
+
+_replica = ContextVar('replica', default=None)
+
+
+@contextmanager
+def replica_reads():
+    replicas = settings.REPLICA_DATABASES
+    token = _replica.set(random.choice(replicas) if replicas else None)
+    try:
+        yield
+    finally:
+        _replica.reset(token)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replica = _replica.get()
+        if replica is not None and model._meta.app_label not in PRIMARY_APPS:
+            return replica
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold copies of the same rows.
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db not in settings.REPLICA_DATABASES
@@ -0,0 +1,28 @@
+import re
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.signals import connection_created
+from django.dispatch import Signal, receiver
+
+
+PRAGMA_VALUE_RE = re.compile(r'-?\w+')
+
+# Sent with `alias` after a read replica has caught up with the primary.
+replica_synced = Signal()
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """Apply `SQLITE_PRAGMAS` to every new SQLite connection."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            if value is None or value == '':
+                continue
+            if not PRAGMA_VALUE_RE.fullmatch(str(value)):
+                raise ImproperlyConfigured(
+                    f'Недопустимое значение PRAGMA {name}: {value!r}'
+                )
+            cursor.execute(f'PRAGMA {name} = {value}')
@@ -0,0 +1,55 @@
+import gzip
+import posixpath
+
+import brotli
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+
+COMPRESSIBLE_EXTENSIONS = {
+    '.css', '.js', '.map', '.svg', '.ico', '.txt', '.json', '.xml', '.html',
+}
+COMPRESSORS = {
+    'gz': lambda content: gzip.compress(content, mtime=0),
+    'br': lambda content: brotli.compress(content, quality=11),
+}
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Hashed static files with gzip and brotli siblings for text assets.
+
+    Without a manifest (collectstatic was never run, as in tests and in
+    development) file names are returned unchanged instead of failing.
+    """
+
+    manifest_strict = False
+
+    def stored_name(self, name):
+        if not self.hashed_files:
+            return name
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in set(self.hashed_files.values()):
+            self.compress(name)
+
+    def compress(self, name):
+        extension = posixpath.splitext(name)[1].lower()
+        if extension not in COMPRESSIBLE_EXTENSIONS:
+            return
+        with self.open(name) as file:
+            content = file.read()
+        for suffix, compressor in COMPRESSORS.items():
+            compressed = compressor(content)
+            if len(compressed) >= len(content):
+                continue
+            target = f'{name}.{suffix}'
+            if self.exists(target):
+                self.delete(target)
+            self._save(target, ContentFile(compressed))
@@ -0,0 +1,231 @@
+import hashlib
+import mimetypes
+import re
+from functools import partial
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    StreamingHttpResponse
+)
+from django.utils._os import safe_join
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers
+)
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import require_safe
+
+
+FILE_ETAG_CACHE_KEY = 'core:file-etag:{digest}:{mtime}:{size}'
+FILE_ETAG_CACHE_TIMEOUT = 60 * 60 * 24
+FILE_CHUNK_SIZE = 64 * 1024
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+PRECOMPRESSED_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+_hashed_names = (None, 0, frozenset())
+
+
+def get_file_etag(path, stat):
+    """Return a strong ETag of the file content, cached per file version."""
+    key = FILE_ETAG_CACHE_KEY.format(
+        digest=hashlib.md5(str(path).encode()).hexdigest(),
+        mtime=stat.st_mtime_ns,
+        size=stat.st_size,
+    )
+    etag = cache.get(key)
+    if etag is None:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(FILE_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        etag = quote_etag(digest.hexdigest())
+        cache.set(key, etag, FILE_ETAG_CACHE_TIMEOUT)
+    return etag
+
+
+def parse_range(header, size):
+    """Return (start, end) of a single byte range, None to ignore it.
+
+    Raises ValueError if the range cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.replace(' ', ''))
+    if match is None:
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        length = int(end)
+        if not length or not size:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start > end:
+        if start < size:
+            return None
+        raise ValueError(header)
+    return start, end
+
+
+def read_range(path, start, end):
+    with open(path, 'rb') as file:
+        file.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = file.read(min(FILE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def get_sendfile_response(path, relative_path):
+    header = settings.MEDIA_SENDFILE_HEADER
+    response = HttpResponse()
+    if header == 'X-Accel-Redirect':
+        response[header] = (
+            settings.MEDIA_ACCEL_REDIRECT_PREFIX.rstrip('/')
+            + '/' + relative_path
+        )
+    else:
+        response[header] = str(path)
+    # The front server fills in the content type for the file it sends.
+    del response['Content-Type']
+    return response
+
+
+def get_hashed_names():
+    """Fingerprinted names of the manifest, collected once per manifest."""
+    global _hashed_names
+    hashed_files = getattr(staticfiles_storage, 'hashed_files', {})
+    loaded, size, names = _hashed_names
+    if loaded is not hashed_files or size != len(hashed_files):
+        names = frozenset(hashed_files.values())
+        _hashed_names = (hashed_files, len(hashed_files), names)
+    return names
+
+
+def get_content_type(path):
+    return mimetypes.guess_type(str(path))[0] or 'application/octet-stream'
+
+
+def get_encoded_path(request, path):
+    """Return the precompressed sibling the client accepts, if any."""
+    accepted = {
+        coding.split(';')[0].strip()
+        for coding in request.META.get('HTTP_ACCEPT_ENCODING', '').split(',')
+    }
+    for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+        candidate = path.with_name(path.name + suffix)
+        if encoding in accepted and candidate.is_file():
+            return candidate, encoding
+    return path, None
+
+
+def get_file_response(request, path, stat, etag, content_type):
+    range_header = request.META.get('HTTP_RANGE')
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if range_header and (if_range is None or if_range == etag):
+        try:
+            byte_range = parse_range(range_header, stat.st_size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+            return response
+        if byte_range is not None:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                read_range(path, start, end),
+                status=206,
+                content_type=content_type,
+            )
+            response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+            response['Content-Length'] = end - start + 1
+            return response
+    return FileResponse(open(path, 'rb'), content_type=content_type)
+
+
+def resolve_file(root, path):
+    try:
+        full_path = Path(safe_join(root, path))
+    except SuspiciousFileOperation:
+        raise Http404
+    if not full_path.is_file():
+        raise Http404
+    return full_path
+
+
+def get_validated_response(request, path, content_type, send=None):
+    """Answer conditional requests, otherwise send the file or a range."""
+    stat = path.stat()
+    etag = get_file_etag(path, stat)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=int(stat.st_mtime)
+    )
+    if response is None:
+        if send is not None:
+            response = send()
+        else:
+            response = get_file_response(
+                request, path, stat, etag, content_type
+            )
+            response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    """Serve an uploaded file with validators, ranges and sendfile."""
+    full_path = resolve_file(settings.MEDIA_ROOT, path)
+    send = None
+    if settings.MEDIA_SENDFILE_HEADER:
+        send = partial(get_sendfile_response, full_path, path)
+    response = get_validated_response(
+        request, full_path, get_content_type(full_path), send
+    )
+    patch_cache_control(
+        response, public=True, max_age=settings.MEDIA_CACHE_MAX_AGE
+    )
+    return response
+
+
+@require_safe
+def serve_static(request, path):
+    """Serve a collected static file, precompressed if the client allows.
+
+    Fingerprinted names from the manifest are cached as immutable, other
+    files are revalidated by their ETag.
+    """
+    if not settings.STATIC_ROOT:
+        raise Http404
+    full_path = resolve_file(settings.STATIC_ROOT, path)
+    encoded_path, encoding = get_encoded_path(request, full_path)
+    response = get_validated_response(
+        request, encoded_path, get_content_type(full_path)
+    )
+    if encoding:
+        response['Content-Encoding'] = encoding
+    patch_vary_headers(response, ('Accept-Encoding',))
+    if path in get_hashed_names():
+        patch_cache_control(
+            response,
+            public=True,
+            max_age=settings.STATIC_CACHE_MAX_AGE,
+            immutable=True,
+        )
+    else:
+        patch_cache_control(response, public=True, no_cache=True)
+    return response
@@ -19,6 +19,7 @@ from typing import (
 import pytest
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
@@ -41,6 +42,26 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def isolated_media(settings, tmp_path):
+    # Uploads and their renditions stay out of the project media and are
+    # finished before the test ends.
+    settings.MEDIA_ROOT = tmp_path
+    settings.POST_IMAGE_ASYNC = False
+
+
+@pytest.fixture(autouse=True)
+def disable_post_scheduler():
+    with override_settings(POST_SCHEDULER_TICKER=False):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -363,6 +384,7 @@ def cleanup(request):
                     filename.endswith(".jpg")
                     or filename.endswith(".gif")
                     or filename.endswith(".png")
+                    or filename.endswith(".webp")
             ):
                 file_path = os.path.join(root, filename)
                 if os.path.getmtime(file_path) >= start_time:
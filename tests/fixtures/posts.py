@@ -109,6 +109,22 @@ def many_posts_with_published_locations(
     )
 
 
+@pytest.fixture
+def make_post(mixer: Mixer, user, published_location, published_category):
+    """Factory of visible posts by `user`; keyword arguments override."""
+    def make(**kwargs):
+        params = {
+            "author": user,
+            "category": published_category,
+            "location": published_location,
+            "is_published": True,
+            "pub_date": timezone.now() - timedelta(days=1),
+        }
+        params.update(kwargs)
+        return mixer.blend("blog.Post", **params)
+    return make
+
+
 @pytest.fixture
 def post_comment_context_form_item(
     user_client: Client, post_with_published_location
@@ -0,0 +1,226 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+COMMENTS_URL = "/admin/blog/comment/"
+
+
+@pytest.fixture
+def admin_comments(mixer, user, another_user, post_with_published_location):
+    other_post = mixer.blend("blog.Post", author=user)
+    return {
+        "by_user": mixer.blend(
+            "blog.Comment", author=user, post=other_post,
+            text="Отличные фотографии",
+        ),
+        "by_another": mixer.blend(
+            "blog.Comment", author=another_user,
+            post=post_with_published_location, text="Спасибо за рецепт",
+        ),
+    }
+
+
+def changelist_ids(admin_client, url, **params):
+    with CaptureQueriesContext(connection) as ctx:
+        response = admin_client.get(url, params)
+    assert response.status_code == HTTPStatus.OK
+    ids = [obj.id for obj in response.context["cl"].result_list]
+    return ids, ctx.captured_queries
+
+
+def test_comment_admin_pages_past_count_limit(
+        admin_client, mixer, monkeypatch, post_with_published_location):
+    from blog.admin import CommentAdmin
+
+    monkeypatch.setattr(CommentAdmin, "list_per_page", 2)
+    mixer.cycle(5).blend("blog.Comment", post=post_with_published_location)
+    response = admin_client.get(COMMENTS_URL)
+    assert "4+" in response.content.decode("utf-8"), (
+        "Убедитесь, что при неполном подсчёте админка показывает, что"
+        " записей может быть больше."
+    )
+    ids, _ = changelist_ids(admin_client, COMMENTS_URL, p=3)
+    assert len(ids) == 1, (
+        "Убедитесь, что в админке можно перейти на страницы за пределами"
+        " подсчитанных записей."
+    )
+    response = admin_client.get(COMMENTS_URL, {"p": 4})
+    assert response.status_code == HTTPStatus.FOUND
+
+
+@pytest.mark.parametrize(
+    "term, expected",
+    [
+        ("#{post_id}", "by_another"),
+        ("{post_id}", "by_another"),
+        ("@{username}", "by_user"),
+        ("фотография", "by_user"),
+    ],
+    ids=["post-hash", "post-id", "author", "text"],
+)
+def test_comment_admin_search(admin_client, admin_comments, term, expected):
+    another = admin_comments["by_another"]
+    term = term.format(
+        post_id=another.post_id,
+        username=admin_comments["by_user"].author.username,
+    )
+    ids, _ = changelist_ids(admin_client, COMMENTS_URL, q=term)
+    assert ids == [admin_comments[expected].id], (
+        "Убедитесь, что в админке комментарии ищутся по номеру публикации,"
+        " `@имени` автора и тексту."
+    )
+
+
+def test_comment_admin_changelist_queries(admin_client, mixer, admin_comments):
+    mixer.cycle(5).blend("blog.Comment")
+    ids, queries = changelist_ids(admin_client, COMMENTS_URL)
+    assert len(ids) == 7
+    sqls = [query["sql"] for query in queries if "blog_comment" in query["sql"]]
+    assert len(sqls) == 2, (
+        "Убедитесь, что список комментариев в админке загружает публикации и"
+        " авторов одним запросом и не пересчитывает все комментарии повторно."
+    )
+    assert any("LIMIT 200" in sql for sql in sqls if "COUNT(" in sql), (
+        "Убедитесь, что комментарии в админке считаются только до конца"
+        " следующей страницы."
+    )
+
+
+POSTS_URL = "/admin/blog/post/"
+
+
+@pytest.fixture
+def admin_posts(mixer, user, published_category):
+    now = timezone.now()
+    hidden_category = mixer.blend("blog.Category", is_published=False)
+    return {
+        "published": mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            pub_date=now - timedelta(days=1),
+        ),
+        "scheduled": mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            pub_date=now + timedelta(days=1),
+        ),
+        "hidden": mixer.blend(
+            "blog.Post", author=user, category=hidden_category,
+            pub_date=now - timedelta(days=1),
+        ),
+    }
+
+
+def test_post_admin_changelist_queries(admin_client, mixer, admin_posts):
+    _, queries = changelist_ids(admin_client, POSTS_URL)
+    mixer.cycle(10).blend("blog.Post")
+    ids, more_queries = changelist_ids(admin_client, POSTS_URL)
+    assert len(ids) == 13
+    assert len(more_queries) == len(queries), (
+        "Убедитесь, что число запросов списка публикаций в админке не растёт"
+        " вместе с числом публикаций."
+    )
+    assert not any(
+        "COUNT(" in query["sql"] and "LIMIT" not in query["sql"]
+        for query in more_queries
+    ), "Убедитесь, что список публикаций в админке не считает всю таблицу."
+    assert not any(
+        "blog_category" in query["sql"] and "blog_post" in query["sql"]
+        for query in more_queries
+    ), "Убедитесь, что список публикаций в админке не загружает категории."
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("published", ["published"]),
+        ("not_published", ["hidden", "scheduled"]),
+        ("scheduled", ["scheduled"]),
+    ],
+)
+def test_post_admin_published_filter(admin_client, admin_posts, value,
+                                     expected):
+    ids, _ = changelist_ids(admin_client, POSTS_URL, is_published=value)
+    assert sorted(ids) == sorted(admin_posts[name].id for name in expected)
+
+
+def test_post_admin_sorts_by_state(admin_client, admin_posts):
+    ids, _ = changelist_ids(admin_client, POSTS_URL, o="3")
+    assert ids[-1] == admin_posts["published"].id, (
+        "Убедитесь, что список публикаций в админке сортируется по признаку"
+        " «Опубликовано»."
+    )
+
+
+def run_action(admin_client, url, action, objects, **data):
+    return admin_client.post(url, {
+        "action": action,
+        ACTION_CHECKBOX_NAME: [obj.pk for obj in objects],
+        **data,
+    })
+
+
+def test_bulk_unpublish_posts(admin_client, client, admin_posts, PostModel):
+    post = admin_posts["published"]
+    assert post.title in client.get("/").content.decode("utf-8")
+    with CaptureQueriesContext(connection) as ctx:
+        run_action(admin_client, POSTS_URL, "unpublish", admin_posts.values())
+    assert not PostModel.objects.filter(is_published=True).exists()
+    assert not any(
+        query["sql"].startswith("UPDATE") and "WHERE" not in query["sql"]
+        for query in ctx.captured_queries
+    )
+    assert post.title not in client.get("/").content.decode("utf-8"), (
+        "Убедитесь, что после массового снятия с публикации кеш страниц"
+        " сбрасывается."
+    )
+
+
+def test_bulk_change_category(admin_client, mixer, admin_posts, PostModel):
+    category = mixer.blend("blog.Category")
+    posts = list(admin_posts.values())
+    response = run_action(admin_client, POSTS_URL, "change_category", posts)
+    assert response.status_code == HTTPStatus.OK
+    assert "form" in response.context, (
+        "Убедитесь, что перед переносом публикаций показывается страница"
+        " выбора категории."
+    )
+    run_action(
+        admin_client, POSTS_URL, "change_category", posts,
+        apply="1", category=category.pk,
+    )
+    assert set(
+        PostModel.objects.values_list("category_id", flat=True)
+    ) == {category.pk}
+
+
+def test_bulk_delete_user_comments(
+        admin_client, client, mixer, user, another_user,
+        post_with_published_location, PostModel, CommentModel
+):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post, author=user)
+    kept = mixer.blend("blog.Comment", post=post, author=another_user)
+    client.get("/")
+
+    run_action(admin_client, "/admin/auth/user/", "delete_comments", [user])
+    assert list(CommentModel.objects.all()) == [kept]
+    assert PostModel.objects.get(pk=post.pk).comments_count == 1, (
+        "Убедитесь, что массовое удаление комментариев обновляет счётчик"
+        " комментариев публикации."
+    )
+    assert "Комментарии (1)" in client.get("/").content.decode("utf-8")
+
+
+def test_bulk_unpublish_author_posts(
+        admin_client, mixer, user, another_user, PostModel
+):
+    mixer.cycle(3).blend("blog.Post", author=user, is_published=True)
+    other = mixer.blend("blog.Post", author=another_user, is_published=True)
+    run_action(admin_client, "/admin/auth/user/", "unpublish_posts", [user])
+    assert list(PostModel.objects.filter(is_published=True)) == [other]
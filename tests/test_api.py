@@ -0,0 +1,114 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_json(client, url, **params):
+    response = client.get(url, params)
+    body = b"".join(response.streaming_content) if response.streaming else (
+        response.content
+    )
+    return response, json.loads(body) if body else None
+
+
+def test_posts_api_lists_visible_posts(
+        client, many_posts_with_published_locations, PostModel
+):
+    hidden = many_posts_with_published_locations[0]
+    hidden.is_published = False
+    hidden.save()
+    response, data = get_json(client, "/api/posts/", limit=100)
+    assert response.status_code == HTTPStatus.OK
+    assert response["Content-Type"] == "application/json"
+    expected = list(
+        PostModel.objects.filter(is_published=True)
+        .order_by("-pub_date", "-id").values_list("id", flat=True)
+    )
+    assert [post["id"] for post in data["results"]] == expected, (
+        "Убедитесь, что API публикаций отдаёт только видимые публикации"
+        " в порядке «от новых к старым»."
+    )
+
+
+def test_posts_api_cursor_pages(client, many_posts_with_published_locations):
+    ids, url = [], "/api/posts/?limit=4"
+    while url:
+        _, data = get_json(client, url)
+        ids.extend(post["id"] for post in data["results"])
+        url = data["next"]
+    assert len(ids) == len(set(ids)) == len(
+        many_posts_with_published_locations
+    ), "Убедитесь, что API публикаций постранично отдаёт все публикации."
+
+
+def test_posts_api_sparse_fields(client, post_with_published_location):
+    with CaptureQueriesContext(connection) as ctx:
+        _, data = get_json(client, "/api/posts/", fields="id,author")
+    assert data["results"] == [{
+        "id": post_with_published_location.id,
+        "author": post_with_published_location.author.username,
+    }]
+    sql = next(
+        query["sql"] for query in ctx.captured_queries
+        if "LIMIT" in query["sql"] and "blog_post" in query["sql"]
+    )
+    assert '"blog_post"."text"' not in sql, (
+        "Убедитесь, что API загружает из базы только запрошенные поля."
+    )
+    response, data = get_json(client, "/api/posts/", fields="id,secret")
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_posts_api_etag(client, post_with_published_location):
+    response, _ = get_json(client, "/api/posts/")
+    etag = response["ETag"]
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get("/api/posts/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert not any(
+        "LIMIT 21" in query["sql"] for query in ctx.captured_queries
+    ), "Убедитесь, что при ответе 304 список публикаций не запрашивается."
+
+    post_with_published_location.title = "Новый заголовок"
+    post_with_published_location.save()
+    response = client.get("/api/posts/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что ETag меняется после изменения публикации."
+    )
+
+
+def test_post_detail_and_comments_api(
+        client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post)
+    _, data = get_json(client, f"/api/posts/{post.id}/", fields="title")
+    assert data == {"title": post.title}
+    _, data = get_json(client, f"/api/posts/{post.id}/comments/")
+    assert [item["text"] for item in data["results"]] == [comment.text]
+    response, _ = get_json(client, "/api/posts/0/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.parametrize(
+    "url, fixture, key",
+    [
+        ("/api/categories/", "published_category", "slug"),
+        ("/api/locations/", "published_location", "name"),
+    ],
+)
+def test_dictionaries_api(client, request, url, fixture, key):
+    obj = request.getfixturevalue(fixture)
+    _, data = get_json(client, url)
+    assert [item[key] for item in data["results"]] == [getattr(obj, key)]
+
+
+def test_profile_api(client, user):
+    _, data = get_json(client, f"/api/profiles/{user.username}/")
+    assert data["username"] == user.username
+    assert "password" not in data
@@ -0,0 +1,42 @@
+import json
+
+import pytest
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+def test_benchmark_covers_every_route(tmp_path, capsys):
+    from blog import urls as blog_urls
+    from pages import urls as pages_urls
+
+    output = tmp_path / "bench.json"
+    call_command(
+        "benchmark", "--posts", "30", "--repeat", "2", "--current-db",
+        "--output", str(output),
+    )
+    report = json.loads(output.read_text(encoding="utf-8"))
+
+    assert report["meta"]["posts"] >= 30
+    routes = {result["route"] for result in report["results"]}
+    expected = {
+        f"{namespace}:{pattern.name}"
+        for namespace, urlconf in (("blog", blog_urls), ("pages", pages_urls))
+        for pattern in urlconf.urlpatterns
+    }
+    assert routes == expected, (
+        "Убедитесь, что бенчмарк замеряет все адреса блога и статических"
+        " страниц."
+    )
+    errors = [
+        result for result in report["results"]
+        if "error" in result and result["route"] != "blog:add_comment"
+    ]
+    assert not errors, (
+        "Убедитесь, что бенчмарк замеряет адреса без ошибок: "
+        + ", ".join(f"{e['route']} ({e['error']})" for e in errors)
+    )
+    for result in report["results"]:
+        if "error" in result:
+            continue
+        assert {"queries", "p50_ms", "p95_ms", "size_bytes"} <= set(result)
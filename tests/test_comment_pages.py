@@ -0,0 +1,70 @@
+from http import HTTPStatus
+
+import pytest
+from bs4 import BeautifulSoup
+
+pytestmark = [pytest.mark.django_db]
+
+N_COMMENTS_PER_PAGE = 20
+
+
+def get_comment_ids(content):
+    soup = BeautifulSoup(content, features="html.parser")
+    return [
+        int(anchor["name"].split("_")[1])
+        for anchor in soup.find_all("a", attrs={"name": True})
+        if anchor["name"].startswith("comment_")
+    ]
+
+
+def get_more_link(content):
+    soup = BeautifulSoup(content, features="html.parser")
+    link = soup.find("a", attrs={"data-comments-more": True})
+    return link["href"] if link else None
+
+
+def test_comment_thread_is_paginated(
+        mixer, unlogged_client, post_with_published_location, CommentModel
+):
+    post = post_with_published_location
+    mixer.cycle(N_COMMENTS_PER_PAGE + 5).blend("blog.Comment", post=post)
+    expected = list(
+        CommentModel.objects.filter(post=post)
+        .order_by("created_at", "id").values_list("id", flat=True)
+    )
+
+    response = unlogged_client.get(f"/posts/{post.id}/")
+    content = response.content.decode("utf-8")
+    seen = get_comment_ids(content)
+    assert len(seen) == N_COMMENTS_PER_PAGE, (
+        "Убедитесь, что на странице публикации выводится ограниченное"
+        " количество комментариев."
+    )
+
+    more_url = get_more_link(content)
+    assert more_url, (
+        "Убедитесь, что на странице публикации есть ссылка на загрузку"
+        " следующих комментариев."
+    )
+    response = unlogged_client.get(more_url)
+    assert response.status_code == HTTPStatus.OK
+    fragment = response.content.decode("utf-8")
+    assert "<html" not in fragment
+    seen.extend(get_comment_ids(fragment))
+    assert get_more_link(fragment) is None
+    assert seen == expected, (
+        "Убедитесь, что комментарии подгружаются по порядку, без пропусков и"
+        " повторов."
+    )
+
+
+def test_comment_fragment_respects_visibility(
+        user_client, unlogged_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+
+    url = f"/posts/{post.id}/comments/"
+    assert unlogged_client.get(url).status_code == HTTPStatus.NOT_FOUND
+    assert user_client.get(url).status_code == HTTPStatus.OK
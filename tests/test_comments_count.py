@@ -0,0 +1,111 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comments_count_follows_views(
+        user_client, post_with_published_location, CommentModel
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/comment/"
+    for i in range(3):
+        response = user_client.post(url, data={"text": f"Comment {i}"})
+        assert response.status_code == HTTPStatus.FOUND
+    post.refresh_from_db()
+    assert post.comments_count == 3, (
+        "Убедитесь, что при добавлении комментария увеличивается счётчик"
+        " комментариев публикации."
+    )
+
+    comment = CommentModel.objects.filter(post=post).first()
+    response = user_client.post(
+        f"/posts/{post.id}/delete_comment/{comment.id}/"
+    )
+    assert response.status_code == HTTPStatus.FOUND
+    post.refresh_from_db()
+    assert post.comments_count == 2, (
+        "Убедитесь, что при удалении комментария уменьшается счётчик"
+        " комментариев публикации."
+    )
+
+
+def test_comments_count_follows_cascade(
+        mixer, another_user, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(2).blend("blog.Comment", post=post, author=another_user)
+    mixer.blend("blog.Comment", post=post)
+    post.refresh_from_db()
+    assert post.comments_count == 3
+
+    another_user.delete()
+    post.refresh_from_db()
+    assert post.comments_count == 1, (
+        "Убедитесь, что счётчик комментариев остаётся верным при каскадном"
+        " удалении комментариев."
+    )
+
+
+def test_recount_comments_command(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(4).blend("blog.Comment", post=post)
+    type(post).objects.update(comments_count=0)
+
+    call_command("recount_comments", stdout=StringIO())
+
+    post.refresh_from_db()
+    assert post.comments_count == 4, (
+        "Убедитесь, что команда `recount_comments` восстанавливает счётчик"
+        " комментариев."
+    )
+
+
+def test_index_queries_do_not_depend_on_cards(
+        mixer, user_client, published_category, published_location
+):
+    def count_queries():
+        with CaptureQueriesContext(connection) as ctx:
+            response = user_client.get("/")
+        assert response.status_code == HTTPStatus.OK
+        return len(ctx.captured_queries)
+
+    mixer.blend(
+        "blog.Post", category=published_category, location=published_location
+    )
+    queries_for_one_card = count_queries()
+
+    posts = mixer.cycle(N_PER_PAGE).blend(
+        "blog.Post", category=published_category, location=published_location
+    )
+    for post in posts:
+        mixer.blend("blog.Comment", post=post)
+
+    assert count_queries() == queries_for_one_card, (
+        "Убедитесь, что количество запросов к базе данных на главной странице"
+        " не зависит от количества публикаций на ней."
+    )
+
+
+def test_comments_count_follows_moved_comment(
+        mixer, post_with_published_location, CommentModel
+):
+    old_post = post_with_published_location
+    new_post = mixer.blend("blog.Post")
+    comment = mixer.blend("blog.Comment", post=old_post)
+    comment = CommentModel.objects.get(pk=comment.pk)
+    comment.post = new_post
+    comment.save()
+    old_post.refresh_from_db()
+    new_post.refresh_from_db()
+    assert (old_post.comments_count, new_post.comments_count) == (0, 1), (
+        "Убедитесь, что при переносе комментария в другую публикацию"
+        " счётчики комментариев обеих публикаций пересчитываются."
+    )
@@ -0,0 +1,93 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.http import Http404
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def cursor_posts(mixer, user, published_category, published_location):
+    now = timezone.now()
+    pub_dates = (
+        now - timedelta(hours=i // 3) for i in range(N_PER_PAGE * 2 + 5)
+    )
+    return mixer.cycle(N_PER_PAGE * 2 + 5).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=published_location,
+        pub_date=pub_dates,
+    )
+
+
+def get_cursor_page(cursor=None):
+    from blog.views import PostListView
+
+    data = {"cursor": cursor} if cursor else {}
+    request = RequestFactory().get("/", data=data)
+    request.user = AnonymousUser()
+    response = PostListView.as_view(cursor_pagination=True)(request)
+    assert response.status_code == HTTPStatus.OK
+    response.render()
+    return response.context_data["page_obj"]
+
+
+def test_cursor_pages_walk_feed(cursor_posts, PostModel):
+    expected = list(
+        PostModel.objects.order_by("-pub_date", "-id")
+        .values_list("id", flat=True)
+    )
+
+    seen, pages, cursor = [], [], None
+    with CaptureQueriesContext(connection) as ctx:
+        while True:
+            page = get_cursor_page(cursor)
+            pages.append(page)
+            seen.extend(post.id for post in page)
+            if not page.has_next():
+                break
+            cursor = page.next_cursor
+    assert seen == expected, (
+        "Убедитесь, что курсорная пагинация проходит ленту без пропусков и"
+        " повторов в порядке «от новых к старым»."
+    )
+    assert not any(
+        "COUNT(" in query["sql"] for query in ctx.captured_queries
+    ), "Убедитесь, что курсорная пагинация не выполняет запрос COUNT(*)."
+
+    page = get_cursor_page(pages[-1].previous_cursor)
+    assert [post.id for post in page] == [post.id for post in pages[-2]], (
+        "Убедитесь, что курсор предыдущей страницы возвращает предыдущую"
+        " страницу."
+    )
+
+
+def test_cursor_tampered_token(cursor_posts):
+    cursor = get_cursor_page().next_cursor
+    with pytest.raises(Http404):
+        get_cursor_page(cursor[:-1] + ("A" if cursor[-1] != "A" else "B"))
+
+
+def test_cursor_previous_page_of_removed_posts(cursor_posts, PostModel):
+    from blog.paginators import CursorPaginator
+
+    paginator = CursorPaginator(PostModel.objects.all(), N_PER_PAGE)
+    first = paginator.page()
+    second = paginator.page(first.next_cursor)
+    PostModel.objects.filter(pk__in=[post.pk for post in first]).delete()
+
+    page = paginator.page(second.previous_cursor)
+    assert [post.id for post in page] == [post.id for post in second], (
+        "Убедитесь, что курсор предыдущей страницы, перед которой не"
+        " осталось публикаций, ведёт на первую страницу."
+    )
+    assert not page.has_previous()
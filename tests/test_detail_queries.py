@@ -0,0 +1,86 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_detail_queries(client, post):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(f"/posts/{post.id}/")
+    assert response.status_code == HTTPStatus.OK
+    return [query["sql"] for query in ctx.captured_queries]
+
+
+def post_loads(queries):
+    return [sql for sql in queries if sql.startswith('SELECT "blog_post"')]
+
+
+@pytest.mark.parametrize("n_comments", [1, 10])
+def test_detail_queries_for_reader(
+        mixer, another_user_client, post_with_published_location, n_comments
+):
+    post = post_with_published_location
+    mixer.cycle(n_comments).blend("blog.Comment", post=post)
+
+    queries = get_detail_queries(another_user_client, post)
+    assert len(post_loads(queries)) == 1, (
+        "Убедитесь, что страница публикации загружает публикацию одним"
+        " запросом, учитывающим её видимость."
+    )
+    assert len(queries) == 4, (
+        "Убедитесь, что количество запросов на странице публикации не"
+        " зависит от количества комментариев:\n" + "\n".join(queries)
+    )
+
+
+def test_detail_single_query_for_unpublished_author(
+        user_client, another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+
+    assert len(post_loads(get_detail_queries(user_client, post))) == 1
+    response = another_user_client.get(f"/posts/{post.id}/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def get_profile_queries(client, username, status=HTTPStatus.OK):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(f"/profile/{username}/")
+    assert response.status_code == status
+    return [query["sql"] for query in ctx.captured_queries]
+
+
+def test_profile_queries(client, mixer, user, published_category):
+    mixer.cycle(3).blend(
+        "blog.Post", author=user, category=published_category
+    )
+    get_profile_queries(client, user.username)
+    queries = get_profile_queries(client, user.username)
+    (post_load,) = post_loads(queries)
+    where = post_load.split(" WHERE ")[1]
+    assert '"blog_post"."author_id" =' in where
+    assert '"auth_user"' not in where, (
+        "Убедитесь, что публикации профиля отбираются по `author_id`."
+    )
+    assert not any("COUNT(" in sql for sql in queries), (
+        "Убедитесь, что число публикаций автора берётся из кеша."
+    )
+    assert len(queries) == 2, (
+        "Убедитесь, что страница профиля загружает пользователя один раз:\n"
+        + "\n".join(queries)
+    )
+
+
+def test_unknown_profile_is_single_query(client):
+    queries = get_profile_queries(
+        client, "nobody", status=HTTPStatus.NOT_FOUND
+    )
+    assert len(queries) == 1, (
+        "Убедитесь, что для несуществующего пользователя публикации не"
+        " запрашиваются."
+    )
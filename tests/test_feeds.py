@@ -0,0 +1,101 @@
+from datetime import timedelta
+from http import HTTPStatus
+from xml.etree import ElementTree
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+def rss_titles(response):
+    root = ElementTree.fromstring(response.content)
+    return [item.findtext("title") for item in root.iter("item")]
+
+
+def test_feeds_list_visible_posts(
+        client, mixer, make_post, user, published_category
+):
+    old = make_post(title="Старая", pub_date=timezone.now() - timedelta(2))
+    new = make_post(title="Новая")
+    make_post(title="Скрытая", is_published=False)
+    make_post(title="Будущая", pub_date=timezone.now() + timedelta(days=1))
+    make_post(title="Чужая", author=mixer.blend("auth.User"))
+    expected = [new.title, old.title]
+    urls = [
+        "/feed/rss/",
+        f"/category/{published_category.slug}/rss/",
+        f"/profile/{user.username}/rss/",
+    ]
+    for url in urls:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response["Content-Type"].startswith("application/rss+xml")
+        titles = rss_titles(response)
+        assert titles[-2:] == expected and "Скрытая" not in titles, (
+            f"Убедитесь, что лента `{url}` показывает только видимые"
+            " публикации от новых к старым."
+        )
+    assert "Чужая" in rss_titles(client.get("/feed/rss/"))
+    assert "Чужая" not in rss_titles(client.get(urls[2]))
+
+
+def test_atom_feed(client, make_post):
+    post = make_post(title="Атом")
+    response = client.get("/feed/atom/")
+    assert response["Content-Type"].startswith("application/atom+xml")
+    root = ElementTree.fromstring(response.content)
+    assert [
+        entry.findtext(f"{ATOM}title") for entry in root.iter(f"{ATOM}entry")
+    ] == [post.title]
+
+
+def test_feed_not_found(client, mixer):
+    category = mixer.blend("blog.Category", is_published=False)
+    assert client.get(f"/category/{category.slug}/rss/").status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+    assert client.get("/profile/nobody/atom/").status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+
+
+def test_feed_conditional_get(client, make_post):
+    post = make_post()
+    response = client.get("/feed/rss/")
+    etag, last_modified = response["ETag"], response["Last-Modified"]
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get("/feed/rss/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert len(ctx.captured_queries) == 1, (
+        "Убедитесь, что ответ 304 для ленты стоит одного запроса к базе."
+    )
+    response = client.get(
+        "/feed/rss/", HTTP_IF_MODIFIED_SINCE=last_modified
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    post.title = "Исправленный заголовок"
+    post.save()
+    response = client.get("/feed/rss/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert "Исправленный заголовок" in rss_titles(response), (
+        "Убедитесь, что лента обновляется после изменения публикации."
+    )
+
+
+def test_feed_body_cached(client, make_post):
+    make_post()
+    client.get("/feed/rss/")
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get("/feed/rss/")
+    assert response.status_code == HTTPStatus.OK
+    assert len(ctx.captured_queries) == 1, (
+        "Убедитесь, что тело ленты берётся из кеша."
+    )
+    make_post(title="Свежая")
+    assert "Свежая" in rss_titles(client.get("/feed/rss/"))
@@ -0,0 +1,95 @@
+from http import HTTPStatus
+
+import pytest
+
+CONTENT = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def media_file(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    (tmp_path / "post_image").mkdir()
+    (tmp_path / "post_image" / "sample.png").write_bytes(CONTENT)
+    return "/media/post_image/sample.png"
+
+
+def get_body(response):
+    if response.streaming:
+        return b"".join(response.streaming_content)
+    return response.content
+
+
+def test_media_served_with_validators(client, media_file):
+    response = client.get(media_file)
+    assert response.status_code == HTTPStatus.OK
+    assert get_body(response) == CONTENT
+    assert response["Content-Type"] == "image/png"
+    assert response["Accept-Ranges"] == "bytes"
+    assert response["ETag"].startswith('"'), (
+        "Убедитесь, что медиафайлы отдаются с сильным ETag."
+    )
+    assert "max-age=" in response["Cache-Control"]
+
+    response = client.get(media_file, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        "Убедитесь, что на запрос с совпадающим `If-None-Match` возвращается"
+        " ответ 304."
+    )
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("bytes=0-9", CONTENT[:10]),
+        ("bytes=1000-", CONTENT[1000:]),
+        ("bytes=-24", CONTENT[-24:]),
+        ("bytes=1020-5000", CONTENT[1020:]),
+    ],
+    ids=["closed", "open-ended", "suffix", "clamped"],
+)
+def test_media_range(client, media_file, header, expected):
+    response = client.get(media_file, HTTP_RANGE=header)
+    assert response.status_code == HTTPStatus.PARTIAL_CONTENT, (
+        "Убедитесь, что медиафайлы поддерживают запросы диапазонов байтов."
+    )
+    assert get_body(response) == expected
+    assert int(response["Content-Length"]) == len(expected)
+    assert response["Content-Range"].endswith(f"/{len(CONTENT)}")
+
+
+def test_media_range_not_satisfiable(client, media_file):
+    response = client.get(media_file, HTTP_RANGE="bytes=5000-")
+    assert response.status_code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+    assert response["Content-Range"] == f"bytes */{len(CONTENT)}"
+
+
+def test_media_stale_if_range_returns_full_file(client, media_file):
+    response = client.get(
+        media_file, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"stale"'
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert get_body(response) == CONTENT
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("X-Accel-Redirect", "/protected-media/post_image/sample.png"),
+        ("X-Sendfile", "{root}/post_image/sample.png"),
+    ],
+)
+def test_media_sendfile(client, settings, media_file, header, expected):
+    settings.MEDIA_SENDFILE_HEADER = header
+    response = client.get(media_file)
+    assert response.status_code == HTTPStatus.OK
+    assert response[header] == expected.format(root=settings.MEDIA_ROOT)
+    assert not response.content, (
+        "Убедитесь, что при передаче файла фронт-серверу тело ответа пустое."
+    )
+
+
+@pytest.mark.parametrize(
+    "url", ["/media/post_image/missing.png", "/media/../settings.py"]
+)
+def test_media_not_found(client, media_file, url):
+    assert client.get(url).status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,70 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def count_object_loads(client, method, url, table, data=None):
+    with CaptureQueriesContext(connection) as ctx:
+        response = getattr(client, method)(url, data=data)
+    object_loads = [
+        query["sql"] for query in ctx.captured_queries
+        if query["sql"].startswith("SELECT")
+        and f'FROM "{table}"' in query["sql"]
+    ]
+    return response, object_loads
+
+
+@pytest.mark.parametrize("method", ["get", "post"])
+@pytest.mark.parametrize("action", ["edit", "delete"])
+def test_post_views_load_post_once(
+        user_client, post_with_published_location, method, action
+):
+    post = post_with_published_location
+    data = {
+        "title": post.title,
+        "text": post.text,
+        "pub_date": post.pub_date.strftime("%Y-%m-%dT%H:%M:%S"),
+        "category": post.category_id,
+        "location": post.location_id,
+    }
+    response, loads = count_object_loads(
+        user_client, method, f"/posts/{post.id}/{action}/", "blog_post", data
+    )
+    assert response.status_code == (
+        HTTPStatus.FOUND if method == "post" else HTTPStatus.OK
+    )
+    assert len(loads) == 1, (
+        f"Убедитесь, что страница `/posts/<post_id>/{action}/` загружает"
+        f" публикацию из базы данных один раз:\n" + "\n".join(loads)
+    )
+    assert '"auth_user"' in loads[0], (
+        "Убедитесь, что публикация загружается вместе с автором."
+    )
+
+
+@pytest.mark.parametrize("method", ["get", "post"])
+@pytest.mark.parametrize("action", ["edit_comment", "delete_comment"])
+def test_comment_views_load_comment_once(
+        mixer, user, user_client, post_with_published_location, method, action
+):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post, author=user)
+    response, loads = count_object_loads(
+        user_client,
+        method,
+        f"/posts/{post.id}/{action}/{comment.id}/",
+        "blog_comment",
+        {"text": "Изменённый комментарий"},
+    )
+    assert response.status_code == (
+        HTTPStatus.FOUND if method == "post" else HTTPStatus.OK
+    )
+    assert len(loads) == 1, (
+        f"Убедитесь, что страница `/posts/<post_id>/{action}/<comment_id>/`"
+        f" загружает комментарий из базы данных один раз:\n"
+        + "\n".join(loads)
+    )
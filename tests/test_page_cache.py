@@ -0,0 +1,94 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_content(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return response.content.decode("utf-8"), len(ctx.captured_queries)
+
+
+@pytest.fixture
+def page_urls(post_with_published_location):
+    post = post_with_published_location
+    return (
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/posts/{post.id}/",
+    )
+
+
+def test_anonymous_pages_are_cached(unlogged_client, page_urls):
+    for url in page_urls:
+        get_content(unlogged_client, url)
+        _, n_queries = get_content(unlogged_client, url)
+        assert n_queries == 0, (
+            f"Убедитесь, что страница `{url}` для анонимного посетителя"
+            " отдаётся из кеша без запросов к базе данных."
+        )
+
+
+def test_pages_with_session_are_not_cached(user_client, page_urls):
+    for url in page_urls:
+        get_content(user_client, url)
+        _, n_queries = get_content(user_client, url)
+        assert n_queries > 0, (
+            f"Убедитесь, что страница `{url}` не берётся из кеша для"
+            " запросов с сессией."
+        )
+
+
+def test_writes_invalidate_pages(
+        user_client, unlogged_client, page_urls, post_with_published_location
+):
+    post = post_with_published_location
+    for url in page_urls:
+        get_content(unlogged_client, url)
+
+    response = user_client.post(
+        f"/posts/{post.id}/edit/",
+        data={
+            "title": "Новый заголовок",
+            "text": "Новый текст публикации",
+            "pub_date": post.pub_date.strftime("%Y-%m-%dT%H:%M:%S"),
+            "category": post.category_id,
+            "location": post.location_id,
+        },
+    )
+    assert response.status_code == HTTPStatus.FOUND
+    for url in page_urls:
+        content, _ = get_content(unlogged_client, url)
+        assert "Новый заголовок" in content, (
+            f"Убедитесь, что после редактирования публикации страница `{url}`"
+            " перестаёт отдаваться из кеша."
+        )
+
+    response = user_client.post(
+        f"/posts/{post.id}/comment/", data={"text": "Новый комментарий"}
+    )
+    assert response.status_code == HTTPStatus.FOUND
+    content, _ = get_content(unlogged_client, f"/posts/{post.id}/")
+    assert "Новый комментарий" in content
+
+
+
+def test_process_local_cache_warning(settings, tmp_path):
+    from core.checks import check_shared_cache
+
+    assert [message.id for message in check_shared_cache(None)] == [
+        "core.W001"
+    ], (
+        "Убедитесь, что проверка проекта предупреждает о кеше, который не"
+        " разделяется между процессами."
+    )
+    settings.CACHES = {"default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": str(tmp_path),
+    }}
+    assert check_shared_cache(None) == []
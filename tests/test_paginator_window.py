@@ -0,0 +1,66 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+N_POSTS = 15
+
+
+@pytest.fixture
+def posts(mixer, user, published_category, published_location):
+    return mixer.cycle(N_POSTS).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=published_location,
+    )
+
+
+def get_page(page):
+    from blog.views import PostListView
+
+    request = RequestFactory().get("/", data={"page": page})
+    request.user = AnonymousUser()
+    with CaptureQueriesContext(connection) as ctx:
+        response = PostListView.as_view(paginate_by=1)(request)
+        assert response.status_code == HTTPStatus.OK
+        response.render()
+    counts = [
+        query for query in ctx.captured_queries
+        if "COUNT(" in query["sql"]
+    ]
+    return response, counts
+
+
+def test_page_range_is_windowed(posts):
+    response, _ = get_page(8)
+    page_range = list(response.context_data["page_range"])
+    ellipsis = response.context_data["paginator"].ELLIPSIS
+    assert page_range == [1, ellipsis, 6, 7, 8, 9, 10, ellipsis, N_POSTS], (
+        "Убедитесь, что пагинатор показывает только соседние номера страниц."
+    )
+    content = response.content.decode("utf-8")
+    assert content.count('class="page-link" href="?page=') < N_POSTS
+
+
+def test_posts_count_is_cached(mixer, posts, published_category):
+    _, counts = get_page(1)
+    assert len(counts) == 1
+    _, counts = get_page(2)
+    assert not counts, (
+        "Убедитесь, что общее количество публикаций берётся из кеша, а не"
+        " считается при каждом запросе."
+    )
+
+    mixer.blend("blog.Post", category=published_category)
+    response, counts = get_page(1)
+    assert len(counts) == 1
+    assert response.context_data["paginator"].count == N_POSTS + 1, (
+        "Убедитесь, что количество публикаций обновляется после добавления"
+        " новой публикации."
+    )
@@ -0,0 +1,68 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_index(client):
+    response = client.get("/")
+    assert response.status_code == HTTPStatus.OK
+    return response
+
+
+def get_card_key(response, post):
+    for card_post in response.context["page_obj"]:
+        if card_post.id == post.id:
+            return make_template_fragment_key(
+                "post_card", [card_post.id, card_post.card_version]
+            )
+    raise AssertionError("Публикация не найдена на главной странице.")
+
+
+def test_post_card_is_cached(user_client, post_with_published_location):
+    post = post_with_published_location
+    response = get_index(user_client)
+    key = get_card_key(response, post)
+    assert post.title in cache.get(key, ""), (
+        "Убедитесь, что отрисованная карточка публикации сохраняется в кеше."
+    )
+    assert get_card_key(get_index(user_client), post) == key, (
+        "Убедитесь, что карточка неизменённой публикации берётся из кеша."
+    )
+
+
+@pytest.mark.parametrize(
+    "change",
+    ["post", "category", "location", "comment"],
+)
+def test_post_card_invalidation(
+        mixer, user_client, post_with_published_location, change
+):
+    post = post_with_published_location
+    key = get_card_key(get_index(user_client), post)
+
+    if change == "post":
+        post.title = "Изменённый заголовок"
+        post.save()
+        expected = post.title
+    elif change == "category":
+        post.category.title = "Изменённая категория"
+        post.category.save()
+        expected = post.category.title
+    elif change == "location":
+        post.location.name = "Изменённое место"
+        post.location.save()
+        expected = post.location.name
+    else:
+        mixer.blend("blog.Comment", post=post)
+        expected = "Комментарии (1)"
+
+    response = get_index(user_client)
+    assert get_card_key(response, post) != key
+    assert expected in response.content.decode("utf-8"), (
+        "Убедитесь, что после изменения публикации, её категории,"
+        " местоположения или комментариев карточка в ленте обновляется."
+    )
@@ -0,0 +1,176 @@
+from http import HTTPStatus
+from io import BytesIO
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from blog.forms import PostForm
+from blog.models import Post
+from blog.images import MAX_IMAGE_SIZE, RENDITION_WIDTHS, rendition_name
+
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+@pytest.fixture
+def media_settings(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.POST_IMAGE_ASYNC = False
+    return settings
+
+
+def make_image(width, height, **save_options):
+    content = BytesIO()
+    Image.new("RGB", (width, height), "teal").save(
+        content, "JPEG", **save_options
+    )
+    return SimpleUploadedFile("wide.jpg", content.getvalue(), "image/jpeg")
+
+
+@pytest.fixture
+def post_with_wide_image(
+        media_settings, mixer, user, published_category, published_location
+):
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=published_location,
+        image=make_image(1500, 1000),
+    )
+
+
+def test_renditions_generated_on_save(post_with_wide_image):
+    name = post_with_wide_image.image.name
+    for width in RENDITION_WIDTHS:
+        target = rendition_name(name, width)
+        assert default_storage.exists(target), (
+            "Убедитесь, что при сохранении публикации с изображением"
+            f" создаётся уменьшенная копия шириной {width}px."
+        )
+        with default_storage.open(target) as file:
+            assert Image.open(file).width == width
+        assert default_storage.exists(rendition_name(name, width, "WEBP")), (
+            "Убедитесь, что для изображения публикации создаются копии"
+            " в формате WebP."
+        )
+    assert default_storage.exists(rendition_name(name, None, "WEBP"))
+
+
+def test_renditions_not_upscaled(
+        media_settings, mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        image=make_image(500, 300),
+    )
+    name = post.image.name
+    assert default_storage.exists(rendition_name(name, 320))
+    assert not default_storage.exists(rendition_name(name, 640)), (
+        "Убедитесь, что копии шире исходного изображения не создаются."
+    )
+
+
+@pytest.mark.parametrize("url_template", ["/", "/posts/{post.id}/"])
+def test_srcset_in_pages(client, post_with_wide_image, url_template):
+    post = post_with_wide_image
+    response = client.get(url_template.format(post=post))
+    assert response.status_code == HTTPStatus.OK
+    content = response.content.decode("utf-8")
+    assert content.count(f'src="{post.image.url}"') == 1
+    assert '<source type="image/webp"' in content, (
+        "Убедитесь, что изображение публикации предлагается браузеру"
+        " в формате WebP через элемент `<picture>`."
+    )
+    for width in RENDITION_WIDTHS:
+        url = default_storage.url(rendition_name(post.image.name, width))
+        assert f"{url} {width}w" in content, (
+            "Убедитесь, что тег `<img>` публикации содержит атрибут `srcset`"
+            " с уменьшенными копиями изображения."
+        )
+
+
+def test_post_form_normalizes_upload(
+        media_settings, user, published_category, published_location
+):
+    exif = Image.Exif()
+    exif[0x010F] = "Camera"
+    width, height = MAX_IMAGE_SIZE[0] * 2, MAX_IMAGE_SIZE[1]
+    upload = make_image(width, height, exif=exif.tobytes())
+    form = PostForm(
+        data={
+            "title": "Заголовок",
+            "text": "Текст",
+            "pub_date": "2022-01-01T00:00:00",
+            "category": published_category.id,
+            "location": published_location.id,
+        },
+        files={"image": upload},
+    )
+    assert form.is_valid(), form.errors
+    image = Image.open(form.cleaned_data["image"])
+    assert image.size == (MAX_IMAGE_SIZE[0], MAX_IMAGE_SIZE[1] // 2), (
+        "Убедитесь, что размеры загружаемого изображения ограничиваются"
+        " с сохранением пропорций."
+    )
+    assert not image.getexif(), (
+        "Убедитесь, что из загружаемого изображения удаляются метаданные."
+    )
+
+
+def test_admin_upload_normalized(
+        media_settings, admin_client, user, published_category,
+        published_location
+):
+    exif = Image.Exif()
+    exif[0x010F] = "Camera"
+    upload = make_image(
+        MAX_IMAGE_SIZE[0] * 2, MAX_IMAGE_SIZE[1], exif=exif.tobytes()
+    )
+    response = admin_client.post("/admin/blog/post/add/", {
+        "title": "Заголовок",
+        "text": "Текст",
+        "pub_date_0": "2022-01-01",
+        "pub_date_1": "00:00:00",
+        "author": user.id,
+        "category": published_category.id,
+        "location": published_location.id,
+        "is_published": "on",
+        "image": upload,
+    })
+    assert response.status_code == HTTPStatus.FOUND, (
+        response.context and response.context["adminform"].form.errors
+    )
+    post = Post.objects.latest("id")
+    with default_storage.open(post.image.name) as file:
+        image = Image.open(file)
+        assert image.size == (MAX_IMAGE_SIZE[0], MAX_IMAGE_SIZE[1] // 2)
+        assert not image.getexif(), (
+            "Убедитесь, что изображения, загруженные через админку, тоже"
+            " очищаются от метаданных и уменьшаются."
+        )
+
+
+def test_renditions_do_not_collide_with_uploads(
+        media_settings, mixer, user, published_category
+):
+    content = BytesIO()
+    Image.new("RGB", (400, 300), "red").save(content, "WEBP")
+    webp_post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        image=SimpleUploadedFile("photo.webp", content.getvalue()),
+    )
+    jpeg_post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        image=SimpleUploadedFile(
+            "photo.jpg", make_image(400, 300).read(), "image/jpeg"
+        ),
+    )
+    target = rendition_name(jpeg_post.image.name, None, "WEBP")
+    assert target != webp_post.image.name
+    with default_storage.open(target) as file:
+        assert Image.open(file).getpixel((0, 0))[2] > 100, (
+            "Убедитесь, что копии изображения не совпадают по имени с"
+            " загруженными файлами других публикаций."
+        )
@@ -0,0 +1,80 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_query_plans(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    plans = {}
+    with connection.cursor() as cursor:
+        for query in ctx.captured_queries:
+            sql = query["sql"]
+            if not sql.startswith("SELECT") or "blog_" not in sql:
+                continue
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            plans[sql] = [row[-1] for row in cursor.fetchall()]
+    return plans
+
+
+@pytest.mark.parametrize(
+    "url_template",
+    [
+        "/",
+        "/?page=2",
+        "/category/{post.category.slug}/",
+        "/profile/{post.author.username}/",
+        "/posts/{post.id}/",
+    ],
+)
+def test_list_views_use_indexes(
+        mixer, user_client, unlogged_client, many_posts_with_published_locations,
+        url_template
+):
+    post = many_posts_with_published_locations[0]
+    mixer.cycle(3).blend("blog.Comment", post=post)
+    url = url_template.format(post=post)
+
+    for client in (user_client, unlogged_client):
+        for sql, plan in get_query_plans(client, url).items():
+            for step in plan:
+                # A partial index on visible posts holds only the rows the
+                # feeds need, so scanning it is a range scan.
+                assert not step.startswith("SCAN") or (
+                    "INDEX post_visible_" in step
+                ), (
+                    f"Убедитесь, что запрос страницы `{url}` не выполняет"
+                    f" полный просмотр таблицы:\n{sql}\n{plan}"
+                )
+                assert "TEMP B-TREE" not in step, (
+                    f"Убедитесь, что запрос страницы `{url}` не сортирует"
+                    f" строки во временном индексе:\n{sql}\n{plan}"
+                )
+
+
+@pytest.mark.parametrize(
+    "url_template", ["/", "/category/{post.category.slug}/"]
+)
+def test_feed_queries_filter_on_visibility_flag(
+        unlogged_client, many_posts_with_published_locations, url_template
+):
+    post = many_posts_with_published_locations[0]
+    url = url_template.format(post=post)
+    feed_sql = [
+        sql for sql in get_query_plans(unlogged_client, url)
+        if "FROM \"blog_post\"" in sql and ("LIMIT" in sql or "COUNT" in sql)
+    ]
+    assert feed_sql
+    for sql in feed_sql:
+        where = sql.split(" WHERE ", 1)[1]
+        assert '"blog_post"."is_visible"' in where
+        assert '"blog_category"."is_published"' not in where
+        assert '"blog_post"."pub_date" <=' not in where, (
+            "Убедитесь, что ленты отбирают публикации по полю `is_visible`,"
+            " не проверяя категорию и текущее время."
+        )
@@ -0,0 +1,116 @@
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection, connections, router
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+from core.routers import replica_reads
+
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+@pytest.fixture
+def replica(settings, tmp_path):
+    alias = "replica1"
+    connections.settings[alias] = {
+        **connection.settings_dict, "NAME": str(tmp_path / "replica.sqlite3")
+    }
+    settings.REPLICA_DATABASES = [alias]
+    yield alias
+    connections[alias].close()
+    del connections[alias]
+    del connections.settings[alias]
+
+
+def index_titles(client):
+    return [post.title for post in client.get("/").context["page_obj"]]
+
+
+def test_router_without_replicas():
+    with replica_reads():
+        assert router.db_for_read(Post) == "default"
+    assert router.db_for_write(Post) == "default"
+
+
+def test_router_uses_replica_only_for_reads(replica):
+    assert router.db_for_read(Post) == "default"
+    with replica_reads():
+        assert router.db_for_read(Post) == replica
+        assert router.db_for_write(Post) == "default"
+
+
+def test_router_keeps_one_replica_per_block(settings):
+    settings.REPLICA_DATABASES = ["replica1", "replica2", "replica3"]
+    for _ in range(10):
+        with replica_reads():
+            aliases = {router.db_for_read(Post) for _ in range(20)}
+        assert len(aliases) == 1, (
+            "Убедитесь, что все чтения одного запроса идут на одну реплику."
+        )
+
+
+def test_list_reads_replica_until_user_writes(
+        replica, client, user_client, make_post
+):
+    synced = make_post(title="Синхронизированная")
+    call_command("sync_replicas")
+    make_post(title="Только на основной")
+
+    assert index_titles(client) == [synced.title], (
+        "Убедитесь, что списки публикаций читаются с реплики."
+    )
+    assert index_titles(user_client) == [synced.title]
+
+    response = user_client.post(
+        f"/posts/{synced.id}/comment/", {"text": "Комментарий"}
+    )
+    assert settings.REPLICA_STICKY_COOKIE_NAME in response.cookies
+    assert index_titles(user_client) == [
+        "Только на основной", synced.title
+    ], (
+        "Убедитесь, что после записи пользователь читает с основной базы"
+        " и видит свои изменения."
+    )
+    assert index_titles(client) == [synced.title]
+
+
+def test_sync_refreshes_replica_caches(replica, client, make_post):
+    make_post(title="Первая")
+    call_command("sync_replicas")
+    assert index_titles(client) == ["Первая"]
+    make_post(title="Вторая")
+    assert index_titles(client) == ["Первая"]
+    call_command("sync_replicas")
+    assert index_titles(client) == ["Вторая", "Первая"], (
+        "Убедитесь, что после синхронизации реплики кеши страниц и"
+        " счётчиков, заполненные с реплики, сбрасываются."
+    )
+
+
+def test_prerendered_pages_follow_replica_router(replica, client, make_post):
+    from blog.scheduler import publish_due
+
+    post = make_post(title="Отложенная")
+    Post.objects.filter(pk=post.pk).update(is_visible=False)
+    call_command("sync_replicas")
+
+    publish_due()
+    with CaptureQueriesContext(connection) as primary, \
+            CaptureQueriesContext(connections[replica]) as replica_ctx:
+        client.get("/")
+    assert not primary.captured_queries + replica_ctx.captured_queries, (
+        "Убедитесь, что планировщик кеширует страницы под теми же ключами,"
+        " что и запросы читателей с реплики."
+    )
+
+
+def test_sync_warns_about_process_local_cache(replica):
+    stderr = StringIO()
+    call_command("sync_replicas", stdout=StringIO(), stderr=stderr)
+    assert "CACHE_BACKEND" in stderr.getvalue(), (
+        "Убедитесь, что `sync_replicas` предупреждает, что без общего кеша"
+        " веб-процессы не узнают об обновлении реплик."
+    )
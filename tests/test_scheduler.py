@@ -0,0 +1,106 @@
+import time
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog import scheduler
+from blog.models import Post
+
+
+def make_due(post):
+    Post.objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() - timedelta(seconds=1)
+    )
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return response.content.decode("utf-8"), len(ctx.captured_queries)
+
+
+@pytest.mark.django_db
+def test_next_due_is_earliest_scheduled_post(make_post):
+    assert scheduler.get_next_due() is None
+    later = timezone.now() + timedelta(hours=2)
+    sooner = timezone.now() + timedelta(hours=1)
+    make_post(pub_date=later)
+    make_post(pub_date=sooner)
+    make_post(pub_date=timezone.now())
+    assert scheduler.get_next_due() == sooner, (
+        "Убедитесь, что планировщик ждёт ближайшую отложенную публикацию."
+    )
+
+
+@pytest.mark.django_db
+def test_publish_due_prerenders_new_post_pages(
+        mixer, make_post, unlogged_client, published_category):
+    other_category = mixer.blend("blog.Category", is_published=True)
+    post = make_post(pub_date=timezone.now() + timedelta(hours=1))
+    other_url = f"/category/{other_category.slug}/"
+    count_queries(unlogged_client, other_url)
+    make_due(post)
+
+    assert scheduler.publish_due() == [post.id]
+    for url in (
+        "/",
+        f"/category/{published_category.slug}/",
+        f"/posts/{post.id}/",
+    ):
+        content, n_queries = count_queries(unlogged_client, url)
+        assert post.title in content
+        assert n_queries == 0, (
+            f"Убедитесь, что после публикации страница `{url}` заранее"
+            " отрисовывается в кеш."
+        )
+    assert count_queries(unlogged_client, other_url)[1] == 0, (
+        "Убедитесь, что публикация по расписанию не сбрасывает кеш"
+        " страниц, на которых новая публикация не появляется."
+    )
+    assert scheduler.publish_due() == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_ticker_publishes_on_time(make_post):
+    ticker = scheduler.start_ticker()
+    try:
+        post = make_post(pub_date=timezone.now() + timedelta(seconds=1))
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            if Post.objects.filter(pk=post.pk, is_visible=True).exists():
+                break
+            time.sleep(0.1)
+        else:
+            pytest.fail(
+                "Убедитесь, что планировщик публикует отложенную публикацию"
+                " в момент её pub_date."
+            )
+    finally:
+        scheduler.stop_ticker()
+        ticker.join(5)
+    assert not ticker.is_alive()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_ticker_starts_with_first_request(client):
+    from blogicum import settings as project_settings
+
+    assert project_settings.POST_SCHEDULER_TICKER
+    with override_settings(POST_SCHEDULER_TICKER=True):
+        client.get("/")
+    ticker = scheduler._ticker
+    try:
+        assert ticker is not None and ticker.is_alive(), (
+            "Убедитесь, что по умолчанию планировщик запускается вместе с"
+            " веб-процессом."
+        )
+    finally:
+        scheduler.stop_ticker()
+        if ticker is not None:
+            ticker.join(5)
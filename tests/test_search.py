@@ -0,0 +1,97 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def search_ids(client, query, **params):
+    response = client.get("/search/", {"q": query, **params})
+    assert response.status_code == HTTPStatus.OK
+    return response, [post.id for post in response.context["page_obj"]]
+
+
+def test_search_stems_russian_words(client, make_post):
+    post = make_post(text="Мы долго гуляли по осенним паркам.")
+    make_post(text="Совсем другая история.")
+    _, ids = search_ids(client, "осенний парк")
+    assert ids == [post.id], (
+        "Убедитесь, что поиск находит публикации по разным формам слов."
+    )
+
+
+def test_search_ranks_title_matches_first(client, make_post):
+    in_text = make_post(text="Рецепт: тыква, мёд и корица.")
+    in_title = make_post(title="Тыква на ужин")
+    _, ids = search_ids(client, "тыквы")
+    assert ids == [in_title.id, in_text.id], (
+        "Убедитесь, что совпадения в заголовке ранжируются выше совпадений"
+        " в тексте."
+    )
+
+
+def test_search_index_follows_changes(client, make_post):
+    post = make_post(text="Про велосипеды.")
+    post.text = "Про самокаты."
+    post.save()
+    assert search_ids(client, "велосипед")[1] == []
+    assert search_ids(client, "самокат")[1] == [post.id]
+    post.delete()
+    assert search_ids(client, "самокат")[1] == [], (
+        "Убедитесь, что поисковый индекс обновляется при изменении и"
+        " удалении публикаций."
+    )
+
+
+def test_search_obeys_visibility(client, mixer, make_post):
+    visible = make_post(text="Горы")
+    make_post(text="Горы", is_published=False)
+    make_post(text="Горы", pub_date=timezone.now() + timedelta(days=1))
+    make_post(
+        text="Горы", category=mixer.blend("blog.Category", is_published=False)
+    )
+    _, ids = search_ids(client, "горы")
+    assert ids == [visible.id], (
+        "Убедитесь, что поиск показывает только опубликованные публикации."
+    )
+
+
+def test_search_cursor_pagination(client, make_post):
+    posts = [make_post(text=f"Море {i}") for i in range(15)]
+    response, first = search_ids(client, "море")
+    page = response.context["page_obj"]
+    assert len(first) == 10
+    _, second = search_ids(client, "море", cursor=page.next_cursor)
+    assert sorted(first + second) == sorted(post.id for post in posts), (
+        "Убедитесь, что результаты поиска разбиваются на страницы курсором"
+        " без пропусков и повторов."
+    )
+
+
+def test_search_uses_index(client, make_post):
+    make_post(text="Озеро")
+    with CaptureQueriesContext(connection) as ctx:
+        search_ids(client, "озеро")
+    sql = next(
+        query["sql"] for query in ctx.captured_queries
+        if "MATCH" in query["sql"]
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        plan = [row[-1] for row in cursor.fetchall()]
+    assert any("VIRTUAL TABLE" in step for step in plan)
+    assert not any(
+        step.split()[:2] == ["SCAN", "blog_post"] for step in plan
+    ), (
+        "Убедитесь, что поиск не просматривает таблицу публикаций целиком."
+    )
+
+
+def test_empty_search(client, make_post):
+    make_post()
+    assert search_ids(client, "")[1] == []
+    assert search_ids(client, "!!!")[1] == []
@@ -0,0 +1,67 @@
+import sqlite3
+
+import pytest
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+
+from core.backends.sqlite3.base import DatabaseWrapper
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "db.sqlite3")
+
+
+@pytest.fixture
+def file_connection(db_path):
+    wrapper = DatabaseWrapper(
+        {**connection.settings_dict, "NAME": db_path}, alias="file"
+    )
+    yield wrapper
+    wrapper.close()
+
+
+def pragma(conn, name):
+    with conn.cursor() as cursor:
+        cursor.execute(f"PRAGMA {name}")
+        return cursor.fetchone()[0]
+
+
+def test_sqlite_pragmas_applied(file_connection):
+    assert pragma(file_connection, "journal_mode") == "wal", (
+        "Убедитесь, что новые соединения с SQLite включают журнал WAL."
+    )
+    assert pragma(file_connection, "synchronous") == 1
+    assert pragma(file_connection, "busy_timeout") == int(
+        settings.SQLITE_PRAGMAS["busy_timeout"]
+    )
+    assert pragma(file_connection, "cache_size") == int(
+        settings.SQLITE_PRAGMAS["cache_size"]
+    )
+
+
+def test_empty_pragma_skipped(settings, file_connection):
+    settings.SQLITE_PRAGMAS = {"journal_mode": "", "busy_timeout": 1234}
+    assert pragma(file_connection, "journal_mode") == "delete"
+    assert pragma(file_connection, "busy_timeout") == 1234
+
+
+def test_invalid_pragma_rejected(settings, file_connection):
+    settings.SQLITE_PRAGMAS = {"busy_timeout": "1; DROP TABLE blog_post"}
+    with pytest.raises(ImproperlyConfigured):
+        file_connection.ensure_connection()
+
+
+def test_transactions_take_write_lock(db_path, file_connection):
+    file_connection.ensure_connection()
+    file_connection._start_transaction_under_autocommit()
+    other = sqlite3.connect(db_path, timeout=0)
+    try:
+        with pytest.raises(sqlite3.OperationalError):
+            other.execute("BEGIN IMMEDIATE")
+    finally:
+        other.close()
+        file_connection.connection.rollback()
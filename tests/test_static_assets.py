@@ -0,0 +1,83 @@
+import gzip
+from http import HTTPStatus
+from io import StringIO
+
+import brotli
+import pytest
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.templatetags.static import static
+from django.test import override_settings
+
+CSS = "css/bootstrap.min.css"
+
+
+@pytest.fixture(scope="module")
+def static_root(tmp_path_factory):
+    root = tmp_path_factory.mktemp("static")
+    with override_settings(STATIC_ROOT=root):
+        call_command("collectstatic", interactive=False, stdout=StringIO())
+    return root
+
+
+@pytest.fixture
+def collected(settings, static_root):
+    settings.STATIC_ROOT = static_root
+    return static_root
+
+
+def test_static_without_manifest():
+    assert static(CSS) == f"/static/{CSS}", (
+        "Убедитесь, что без манифеста статические файлы доступны"
+        " по исходным именам."
+    )
+
+
+@pytest.mark.django_db
+def test_bootstrap_served_locally(client):
+    content = client.get("/").content.decode("utf-8")
+    assert "cdn.jsdelivr.net" not in content
+    assert 'href="/static/css/bootstrap' in content, (
+        "Убедитесь, что стили Bootstrap подключаются из статических файлов"
+        " проекта."
+    )
+
+
+def test_collectstatic_hashes_and_compresses(collected):
+    url = static(CSS)
+    assert url != f"/static/{CSS}", (
+        "Убедитесь, что после collectstatic `{% static %}` возвращает имена"
+        " с отпечатком содержимого."
+    )
+    name = staticfiles_storage.stored_name(CSS)
+    original = (collected / name).read_bytes()
+    assert gzip.decompress((collected / f"{name}.gz").read_bytes()) == (
+        original
+    )
+    assert brotli.decompress((collected / f"{name}.br").read_bytes()) == (
+        original
+    )
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected_encoding",
+    [("gzip, deflate, br", "br"), ("gzip", "gzip"), ("", None)],
+)
+def test_static_served_precompressed(
+        client, collected, accept_encoding, expected_encoding
+):
+    response = client.get(static(CSS), HTTP_ACCEPT_ENCODING=accept_encoding)
+    assert response.status_code == HTTPStatus.OK
+    assert response["Content-Type"] == "text/css"
+    assert response.get("Content-Encoding") == expected_encoding
+    assert "Accept-Encoding" in response["Vary"]
+    assert "immutable" in response["Cache-Control"]
+    assert "max-age=31536000" in response["Cache-Control"], (
+        "Убедитесь, что статические файлы с отпечатком кешируются на год."
+    )
+
+
+def test_unhashed_static_revalidated(client, collected):
+    response = client.get(f"/static/{CSS}")
+    assert response.status_code == HTTPStatus.OK
+    assert "no-cache" in response["Cache-Control"]
@@ -0,0 +1,89 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog import moderation
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def post(mixer, published_category):
+    return mixer.blend(
+        "blog.Post",
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(hours=1),
+    )
+
+
+def is_visible(post):
+    return Post.objects.values_list("is_visible", flat=True).get(pk=post.pk)
+
+
+def test_visibility_follows_post_changes(post):
+    assert is_visible(post)
+    post.is_published = False
+    post.save(update_fields=["is_published"])
+    assert not is_visible(post)
+    post.is_published = True
+    post.pub_date = timezone.now() + timedelta(hours=1)
+    post.save()
+    assert not is_visible(post), (
+        "Убедитесь, что `is_visible` пересчитывается при сохранении"
+        " публикации."
+    )
+
+
+def test_visibility_follows_category(post, published_category):
+    published_category.is_published = False
+    published_category.save()
+    assert not is_visible(post)
+    published_category.is_published = True
+    published_category.save()
+    assert is_visible(post)
+    published_category.delete()
+    assert not is_visible(post), (
+        "Убедитесь, что `is_visible` пересчитывается при изменении и"
+        " удалении категории."
+    )
+
+
+def test_bulk_moderation_keeps_visibility(post, published_category):
+    list(moderation.set_posts_published(Post.objects.all(), False))
+    assert not is_visible(post)
+    list(moderation.set_posts_published(Post.objects.all(), True))
+    assert is_visible(post)
+    list(moderation.set_categories_published(
+        type(published_category).objects.all(), False
+    ))
+    assert not is_visible(post)
+
+
+def test_publish_scheduled(client, post):
+    Post.objects.filter(pk=post.pk).update(
+        is_visible=False, pub_date=timezone.now() - timedelta(seconds=1)
+    )
+    assert post.title not in client.get("/").content.decode()
+    call_command("publish_scheduled", stdout=StringIO())
+    assert is_visible(post)
+    assert post.title in client.get("/").content.decode(), (
+        "Убедитесь, что команда `publish_scheduled` показывает отложенные"
+        " публикации, время которых наступило, и сбрасывает кеш страниц."
+    )
+
+
+def test_bulk_publication_wakes_scheduler(post, monkeypatch):
+    from blog import scheduler
+
+    calls = []
+    monkeypatch.setattr(scheduler, "reschedule", lambda: calls.append(1))
+    list(moderation.set_posts_published(Post.objects.all(), True))
+    assert calls, (
+        "Убедитесь, что массовая публикация будит планировщик отложенных"
+        " публикаций."
+    )